@@ -0,0 +1,106 @@
+# Statystyki stopni aktualizowane przy każdej zmianie grafu:
+# stopnie wejściowe/wyjściowe, histogram stopni oraz liczba wierzchołków
+# o nieparzystym stopniu. Minimum i maksimum przesuwają się o co najwyżej
+# tyle pozycji, o ile zmienił się stopień, więc aktualizacja jest O(1).
+class DegreeStats:
+    def __init__(self, directed=False, num_vertices=0):
+        self.directed = directed
+        self.in_degree = [0] * num_vertices
+        self.out_degree = [0] * num_vertices
+        self.degree = [0] * num_vertices
+        self.histogram = [num_vertices]
+        self.odd = 0
+        self.low = 0
+        self.high = 0
+
+    def __len__(self):
+        return len(self.degree)
+
+    def add_vertex(self):
+        self.in_degree.append(0)
+        self.out_degree.append(0)
+        self.degree.append(0)
+        self.histogram[0] += 1
+        self.low = 0
+
+    # Wierzchołek musi być wcześniej odłączony od wszystkich krawędzi
+    def pop_vertex(self, v):
+        self.in_degree.pop(v)
+        self.out_degree.pop(v)
+        self.degree.pop(v)
+        self.histogram[0] -= 1
+        if not self.degree:
+            self.low = self.high = 0
+            return
+        while self.histogram[self.low] == 0:
+            self.low += 1
+
+    # Wczytanie gotowych stopni (np. po hurtowym dodaniu krawędzi)
+    def set_degrees(self, in_degree, out_degree, degree):
+        self.in_degree = list(in_degree)
+        self.out_degree = list(out_degree)
+        self.degree = list(degree)
+        self.high = max(self.degree, default=0)
+        self.low = min(self.degree, default=0)
+        self.histogram = [0] * (self.high + 1)
+        for d in self.degree:
+            self.histogram[d] += 1
+        self.odd = sum(d % 2 for d in self.degree)
+
+    def add_edge(self, i, j, count=1):
+        self.out_degree[i] += count
+        self.in_degree[j] += count
+        if not self.directed and i != j:
+            self.out_degree[j] += count
+            self.in_degree[i] += count
+        self._change(i, count)
+        self._change(j, count)
+
+    def remove_edge(self, i, j, count=1):
+        self.out_degree[i] -= count
+        self.in_degree[j] -= count
+        if not self.directed and i != j:
+            self.out_degree[j] -= count
+            self.in_degree[i] -= count
+        self._change(i, -count)
+        self._change(j, -count)
+
+    def _change(self, v, delta):
+        old = self.degree[v]
+        new = old + delta
+        self.degree[v] = new
+        if new >= len(self.histogram):
+            self.histogram.extend([0] * (new + 1 - len(self.histogram)))
+        self.histogram[old] -= 1
+        self.histogram[new] += 1
+        if delta % 2:
+            self.odd += 1 if old % 2 == 0 else -1
+        if new > self.high:
+            self.high = new
+        if new < self.low:
+            self.low = new
+        while self.histogram[self.high] == 0 and self.high > 0:
+            self.high -= 1
+        while self.histogram[self.low] == 0 and self.low < self.high:
+            self.low += 1
+
+    def vertex_degree(self, v):
+        if self.directed:
+            return self.in_degree[v], self.out_degree[v], self.degree[v]
+        return self.degree[v]
+
+    def min_degree(self):
+        return self.low if self.degree else 0
+
+    def max_degree(self):
+        return self.high if self.degree else 0
+
+    def even_odd(self):
+        return len(self.degree) - self.odd, self.odd
+
+    # Sortowanie przez zliczanie po histogramie
+    def sorted_desc(self):
+        result = []
+        for d in range(self.high, self.low - 1, -1):
+            result.extend([d] * self.histogram[d])
+        return result
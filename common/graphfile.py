@@ -0,0 +1,163 @@
+import os
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+# Szybkie wczytywanie plików z krawędziami:
+#   S / N            - typ grafu (opcjonalny nagłówek)
+#   liczba wierzchołków
+#   i j [w]          - krawędzie (numeracja od 1), opcjonalnie z wagą
+# Wszystkie liczby, także wagi, muszą być całkowite (wagi zapisywane są
+# jako int32).
+# Część z krawędziami jest parsowana wektorowo z pliku zmapowanego
+# w pamięci, a wynik zapisywany do pliku <nazwa>.bin, który przy kolejnym
+# uruchomieniu (jeśli plik tekstowy się nie zmienił) jest tylko mapowany.
+
+EdgeFile = namedtuple("EdgeFile", ["kind", "num_vertices", "edges", "weights"])
+
+MAGIC = b"GRPH"
+VERSION = 1
+CACHE_HEADER = struct.Struct("<4sIIIqqqq")
+CHUNK_SIZE = 1 << 24
+
+_ALLOWED = np.zeros(256, dtype=bool)
+_ALLOWED[[ord(c) for c in "0123456789- \t\r\n"]] = True
+
+
+def cache_path(filename):
+    return f"{filename}.bin"
+
+
+def parse_ints(buf):
+    buf = np.asarray(buf, dtype=np.uint8)
+    if not _ALLOWED[buf].all():
+        bad = chr(buf[np.flatnonzero(~_ALLOWED[buf])[0]])
+        if bad in ".,eE":
+            raise ValueError(f"Nieprawidłowy znak w danych: {bad!r} - obsługiwane są tylko liczby całkowite "
+                             "(także wagi).")
+        raise ValueError(f"Nieprawidłowy znak w danych: {bad!r}")
+    digit = (buf >= 48) & (buf <= 57)
+    edges = np.diff(np.concatenate(([0], digit.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) == 0:
+        return np.empty(0, dtype=np.int64)
+    lengths = ends - starts
+    if lengths.max() > 18:
+        raise ValueError("Zbyt duża liczba w danych.")
+    positions = np.flatnonzero(digit)
+    run = np.repeat(np.arange(len(starts)), lengths)
+    exponent = ends[run] - positions - 1
+    digits = (buf[positions] - 48).astype(np.int64) * (10 ** exponent)
+    offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    values = np.add.reduceat(digits, offsets)
+    signs = np.zeros(len(starts), dtype=bool)
+    signs[starts > 0] = buf[starts[starts > 0] - 1] == ord("-")
+    values[signs] = -values[signs]
+    return values
+
+
+def _read_ints(filename, offset):
+    size = os.path.getsize(filename)
+    if size <= offset:
+        return np.empty(0, dtype=np.int64)
+    data = np.memmap(filename, dtype=np.uint8, mode="r")
+    parts = []
+    pos = offset
+    while pos < size:
+        end = min(pos + CHUNK_SIZE, size)
+        if end < size:
+            newlines = np.flatnonzero(data[pos:end] == ord("\n"))
+            if len(newlines):
+                end = pos + newlines[-1] + 1
+        parts.append(parse_ints(data[pos:end]))
+        pos = end
+    del data
+    return np.concatenate(parts)
+
+
+def _read_header(filename):
+    with open(filename, "rb") as f:
+        kind = f.readline()
+        count = f.readline()
+        offset = f.tell()
+    kind = kind.decode().strip()
+    try:
+        num_vertices = int(count.strip())
+    except ValueError:
+        raise ValueError(f"Nieprawidłowa liczba wierzchołków: {count.decode().strip()!r}")
+    return kind, num_vertices, offset
+
+
+def _source_stamp(filename):
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_cache(filename, columns, header):
+    path = cache_path(filename)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read(CACHE_HEADER.size)
+    except OSError:
+        return None
+    if len(raw) != CACHE_HEADER.size:
+        return None
+    magic, version, flags, cols, num_vertices, m, size, mtime = CACHE_HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION or cols != columns or bool(flags & 4) == header:
+        return None
+    if (size, mtime) != _source_stamp(filename):
+        return None
+    kind = ("S" if flags & 1 else "N") if header else None
+    if m == 0:
+        edges = np.empty((0, 2), dtype=np.int32)
+        weights = np.empty(0, dtype=np.int32) if columns == 3 else None
+        return EdgeFile(kind, num_vertices, edges, weights)
+    edges = np.memmap(path, dtype=np.int32, mode="r", offset=CACHE_HEADER.size, shape=(m, 2))
+    weights = None
+    if columns == 3:
+        weights = np.memmap(path, dtype=np.int32, mode="r", offset=CACHE_HEADER.size + edges.nbytes, shape=(m,))
+    return EdgeFile(kind, num_vertices, edges, weights)
+
+
+def _write_cache(filename, data, columns, header):
+    flags = (1 if data.kind == "S" else 0) | (2 if columns == 3 else 0) | (0 if header else 4)
+    size, mtime = _source_stamp(filename)
+    path = cache_path(filename)
+    tmp = f"{path}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(CACHE_HEADER.pack(MAGIC, VERSION, flags, columns, data.num_vertices, len(data.edges), size, mtime))
+            f.write(np.ascontiguousarray(data.edges, dtype=np.int32).tobytes())
+            if data.weights is not None:
+                f.write(np.ascontiguousarray(data.weights, dtype=np.int32).tobytes())
+        os.replace(tmp, path)
+    except OSError:
+        # Brak pliku pomocniczego spowalnia tylko kolejne wczytanie
+        pass
+
+
+def load_edge_file(filename, columns=2, header=True, cache=True):
+    if cache:
+        data = _read_cache(filename, columns, header)
+        if data is not None:
+            return data
+
+    if header:
+        kind, num_vertices, offset = _read_header(filename)
+    else:
+        kind, num_vertices, offset = None, 0, 0
+    values = _read_ints(filename, offset)
+    if len(values) % columns:
+        raise ValueError(f"Każda krawędź musi mieć {columns} liczby.")
+    values = values.reshape(-1, columns)
+    edges = values[:, :2].astype(np.int32)
+    weights = values[:, 2].astype(np.int32) if columns == 3 else None
+    if not header:
+        num_vertices = int(edges.max()) if len(edges) else 0
+    data = EdgeFile(kind, num_vertices, edges, weights)
+
+    if cache and (not header or kind in ("S", "N")):
+        _write_cache(filename, data, columns, header)
+    return data
@@ -0,0 +1,90 @@
+import json
+import sys
+from contextlib import redirect_stdout
+
+# Tryb wsadowy: jedna operacja w linii, np.
+#   add_edge 1 2
+#   delete_edge 1 2
+#   add_vertex
+#   delete_vertex 3
+#   degree 3
+#   min_degree | max_degree | even_odd | sorted_degrees
+# Zmiany nie są rysowane, a wyniki zapytań są wypisywane jako linie JSON.
+# Komunikaty grafu (np. o nieistniejącym wierzchołku) trafiają na stderr.
+
+MUTATIONS = {"add_edge": 2, "delete_edge": 2, "add_vertex": 0, "delete_vertex": 1}
+QUERIES = {"degree": 1, "min_degree": 0, "max_degree": 0, "even_odd": 0, "sorted_degrees": 0}
+
+
+def parse_operations(lines):
+    for number, line in enumerate(lines, 1):
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        op, *args = parts
+        arity = MUTATIONS.get(op, QUERIES.get(op))
+        if arity is None:
+            raise ValueError(f"Linia {number}: nieznana operacja {op!r}")
+        if len(args) != arity:
+            raise ValueError(f"Linia {number}: operacja {op} wymaga {arity} argumentów")
+        try:
+            args = [int(a) for a in args]
+        except ValueError:
+            raise ValueError(f"Linia {number}: argumenty muszą być liczbami całkowitymi")
+        yield op, args
+
+
+def query(graph, op, args):
+    result = {"op": op, "args": args}
+    if op == "degree":
+        v = args[0]
+        if v < 1 or v > graph.num_vertices:
+            result["error"] = "Wierzchołek nie istnieje."
+            return result
+        degree = graph.vertex_degree(v)
+        if graph.directed:
+            result["result"] = dict(zip(("in", "out", "total"), degree))
+        else:
+            result["result"] = degree
+    elif op == "min_degree":
+        result["result"] = graph.min_graph_degree()
+    elif op == "max_degree":
+        result["result"] = graph.max_graph_degree()
+    elif op == "even_odd":
+        result["result"] = dict(zip(("even", "odd"), graph.even_odd_degrees()))
+    elif op == "sorted_degrees":
+        result["result"] = graph.sorted_vertex_degrees()
+    return result
+
+
+def run_batch(graph, lines, out=sys.stdout, log=sys.stderr):
+    pending = []
+    applied = 0
+
+    # Kolejne dodania krawędzi są wykonywane razem; hurtowe dodanie k krawędzi
+    # kosztuje O(V + k log k) w obu reprezentacjach (stopnie wszystkich
+    # wierzchołków są przeliczane), więc krótkie serie idą pojedynczo.
+    def flush():
+        with redirect_stdout(log):
+            if len(pending) > graph.num_vertices:
+                graph.add_edges(pending)
+            else:
+                for i, j in pending:
+                    graph.add_edge(i, j)
+        pending.clear()
+
+    for op, args in parse_operations(lines):
+        applied += 1
+        if op == "add_edge":
+            pending.append(args)
+            continue
+        if pending:
+            flush()
+        if op in MUTATIONS:
+            with redirect_stdout(log):
+                getattr(graph, op)(*args)
+        else:
+            out.write(json.dumps(query(graph, op, args)) + "\n")
+    if pending:
+        flush()
+    return applied
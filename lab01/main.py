@@ -1,133 +1,139 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+import numpy as np
+from storage import make_storage
+from degrees import DegreeStats
+from graphfile import load_edge_file
 
 class Graph:
-    def __init__(self, directed=False):
+    def __init__(self, directed=False, backend="dense", renderer=None):
         self.directed = directed
-        self.matrix = []
+        self.backend = backend
+        self.renderer = renderer
+        self.storage = make_storage(backend)
+        self.degrees = DegreeStats(directed)
         self.num_vertices = 0
 
+    @property
+    def matrix(self):
+        return self.storage.to_matrix()
+
     def add_vertex(self):
         self.num_vertices += 1
-        for row in self.matrix:
-            row.append(0)
-        self.matrix.append([0] * self.num_vertices)
+        self.storage.add_vertex()
+        self.degrees.add_vertex()
 
     def delete_vertex(self, v):
         if v < 1 or v > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return
         v -= 1
-        self.matrix.pop(v)
-        for row in self.matrix:
-            row.pop(v)
+        for u, count in self.storage.out_neighbors(v):
+            if u == v and not self.directed:
+                count //= 2
+            self.degrees.remove_edge(v, u, count)
+        if self.directed:
+            for u, count in self.storage.in_neighbors(v):
+                if u != v:
+                    self.degrees.remove_edge(u, v, count)
+        self.degrees.pop_vertex(v)
+        self.storage.delete_vertex(v)
         self.num_vertices -= 1
+        if self.renderer is not None:
+            self.renderer.vertex_deleted(v+1)
 
     def add_edge(self, i, j):
         if i < 1 or j < 1 or i > self.num_vertices or j > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return
-        self.matrix[i-1][j-1] += 1
+        self.storage.change(i-1, j-1, 1)
         if not self.directed:
-            self.matrix[j-1][i-1] += 1
+            self.storage.change(j-1, i-1, 1)
+        self.degrees.add_edge(i-1, j-1)
+
+    # Hurtowe dodanie krawędzi (tablica par i j, numeracja od 1)
+    def add_edges(self, edges):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        valid = ((edges >= 1) & (edges <= self.num_vertices)).all(axis=1)
+        if not valid.all():
+            print(f"Wierzchołek nie istnieje. Pominięto krawędzi: {len(edges) - int(valid.sum())}")
+        i = edges[valid, 0] - 1
+        j = edges[valid, 1] - 1
+        n = self.num_vertices
+        if self.directed:
+            self.storage.add_edges(i, j)
+            out_degree = np.bincount(i, minlength=n)
+            in_degree = np.bincount(j, minlength=n)
+        else:
+            self.storage.add_edges(np.concatenate((i, j)), np.concatenate((j, i)))
+            out_degree = np.bincount(i, minlength=n) + np.bincount(j[i != j], minlength=n)
+            in_degree = np.bincount(j, minlength=n) + np.bincount(i[i != j], minlength=n)
+        degree = np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+        self.degrees.set_degrees(
+            (in_degree + self.degrees.in_degree).tolist(),
+            (out_degree + self.degrees.out_degree).tolist(),
+            (degree + self.degrees.degree).tolist(),
+        )
 
     def delete_edge(self, i, j):
         if i < 1 or j < 1 or i > self.num_vertices or j > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return
-        if self.matrix[i-1][j-1] == 0:
+        if self.storage.count(i-1, j-1) == 0:
             print("Krawędź nie istnieje.")
             return
-        self.matrix[i-1][j-1] -= 1
+        self.storage.change(i-1, j-1, -1)
         if not self.directed:
-            self.matrix[j-1][i-1] -= 1
+            self.storage.change(j-1, i-1, -1)
+        self.degrees.remove_edge(i-1, j-1)
 
     def vertex_degree(self, v):
         if v < 1 or v > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return 0
-        v -= 1
-        if self.directed:
-            in_degree = sum(self.matrix[i][v] for i in range(self.num_vertices))
-            out_degree = sum(self.matrix[v][i] for i in range(self.num_vertices))
-            return in_degree, out_degree, in_degree+out_degree
-        else:
-            return sum(self.matrix[v])
+        return self.degrees.vertex_degree(v-1)
 
     def min_graph_degree(self):
-        if self.num_vertices == 0:
-            return 0
-        if not self.directed:
-            return min(self.vertex_degree(v+1) for v in range(self.num_vertices))
-        else:
-            return min(self.vertex_degree(v+1)[2] for v in range(self.num_vertices))
-
+        return self.degrees.min_degree()
 
     def max_graph_degree(self):
-        if self.num_vertices == 0:
-            return 0
-        if not self.directed:
-            return max(self.vertex_degree(v+1) for v in range(self.num_vertices))
-        else:
-            return max(self.vertex_degree(v+1)[2] for v in range(self.num_vertices))
-
+        return self.degrees.max_degree()
 
     def even_odd_degrees(self):
-        even, odd = 0, 0
-        for v in range(self.num_vertices):
-            if not self.directed:
-                if self.vertex_degree(v+1) % 2 == 0:
-                    even += 1
-                else:
-                    odd += 1
-            else:
-                _, _, sum_degree = self.vertex_degree(v+1)
-                if sum_degree % 2 == 0:
-                    even += 1
-                else: 
-                    odd += 1                
-        return even, odd
+        return self.degrees.even_odd()
 
     def sorted_vertex_degrees(self):
-        if not self.directed:
-            degrees = [self.vertex_degree(v+1) for v in range(self.num_vertices)]
-            return sorted(degrees, reverse=True)
-        else:
-            degrees = [self.vertex_degree(v+1)[2] for v in range(self.num_vertices)]
-            return sorted(degrees, reverse=True)
+        return self.degrees.sorted_desc()
 
     def draw_graph(self, filename):
+        if self.renderer is not None:
+            self.renderer.draw(self, filename)
+            return
         plt.clf()
         G = nx.DiGraph() if self.directed else nx.Graph()
-        size = len(self.matrix)
-        for i in range(size):
+        for i in range(self.num_vertices):
             G.add_node(i+1)
-        for i in range(size):
-            for j in range(size):
-                if self.matrix[i][j] > 0:
-                    for _ in range(self.matrix[i][j]):
-                        G.add_edge(i+1, j+1)
+        for i, j, count in self.storage.edges():
+            for _ in range(count):
+                G.add_edge(i+1, j+1)
         pos = nx.spring_layout(G)
         nx.draw(G, pos, with_labels=True, node_color='lightblue', font_weight='bold')
         plt.savefig(f"{filename}.png")
 
     def load_from_file(self, filename):
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines() 
-                graph_type = lines[0].strip()
-                if graph_type == 'S':
-                    self.directed = True
-                elif graph_type == 'N':
-                    self.directed = False
-                else:
-                    raise ValueError("Nieprawidłowy typ grafu. Użyj 'S' dla skierowanego lub 'N' dla nieskierowanego.")    
-                self.num_vertices = int(lines[1].strip())
-                self.matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
-                for line in lines[2:]:
-                    i, j = map(int, line.split())
-                    self.add_edge(i, j)
-        
+            data = load_edge_file(filename, columns=2)
+            if data.kind == 'S':
+                self.directed = True
+            elif data.kind == 'N':
+                self.directed = False
+            else:
+                raise ValueError("Nieprawidłowy typ grafu. Użyj 'S' dla skierowanego lub 'N' dla nieskierowanego.")
+            self.num_vertices = data.num_vertices
+            self.storage = make_storage(self.backend, self.num_vertices)
+            self.degrees = DegreeStats(self.directed, self.num_vertices)
+            self.add_edges(data.edges)
+
         except FileNotFoundError:
             print("Plik nie został znaleziony.")
         except ValueError as ve:
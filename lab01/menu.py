@@ -1,8 +1,20 @@
+import argparse
+import sys
+from contextlib import redirect_stdout
 from main import Graph
+from render import GraphRenderer
+from batch import run_batch
 
-g = Graph()
-g.load_from_file("file.txt")
-g.draw_graph("basegraph")
+parser = argparse.ArgumentParser(description="Operacje na grafie")
+parser.add_argument("--file", default="file.txt", help="plik z grafem")
+parser.add_argument("--backend", default="dense", choices=["dense", "sparse"], help="sposób przechowywania grafu")
+parser.add_argument("--headless", action="store_true", help="nie rysuj grafu po zmianach")
+parser.add_argument("--batch", metavar="PLIK", help="wykonaj operacje z pliku ('-' oznacza stdin)")
+parser.add_argument("--draw", metavar="NAZWA", help="w trybie wsadowym narysuj graf po wykonaniu wszystkich operacji")
+args = parser.parse_args()
+
+renderer = GraphRenderer(headless=args.headless)
+g = Graph(backend=args.backend, renderer=renderer)
 
 def print_menu():
     print("Program przechowuje graf i pozwala na następujące operacji")
@@ -17,6 +29,13 @@ def print_menu():
     print("9 - Wypisanie (posortowanego nierosnąco) ciągu stopni wierzchołków w grafie")
     print("0 - Wyjście")
 
+def redraw():
+    if renderer.headless:
+        return
+    print("Wprowadź nazwę pliku dla tego grafu")
+    data = input()
+    g.draw_graph(data)
+
 def main():
     while True:
         print_menu()
@@ -27,29 +46,21 @@ def main():
             i = int(input())
             j = int(input())
             g.add_edge(i, j)
-            print("Wprowadź nazwę pliku dla tego grafu")
-            data = input()
-            g.draw_graph(data)
+            redraw()
         if choose == 2:
             print("Między jakimi wierszchołkami usunąć krawedź? Wprowadź 2 liczby")
             i = int(input())
             j = int(input())
             g.delete_edge(i, j)
-            print("Wprowadź nazwę pliku dla tego grafu")
-            data = input()
-            g.draw_graph(data)
+            redraw()
         if choose == 3:
             g.add_vertex()
-            print("Wprowadź nazwę pliku dla tego grafu")
-            data = input()
-            g.draw_graph(data)
+            redraw()
         if choose == 4:
             print("Jaki wierszchołek usunąć?")
             v = int(input())
             g.delete_vertex(v)
-            print("Wprowadź nazwę pliku dla tego grafu")
-            data = input()
-            g.draw_graph(data)
+            redraw()
         if choose == 5:
             print("Stopień jakiego wierszchołka trzeba wyznaczyć?")
             v = int(input())
@@ -70,13 +81,29 @@ def main():
             print(f"Stopni wierszchołków posortowane nierosnąco: {sorted}")
         if choose == 0:
             print("Koniec programu")
+            renderer.close()
             break
 
-main()
-
-
-
-
-
-
+def batch():
+    with redirect_stdout(sys.stderr):
+        g.load_from_file(args.file)
+    try:
+        if args.batch == "-":
+            run_batch(g, sys.stdin)
+        else:
+            with open(args.batch) as f:
+                run_batch(g, f)
+    except (OSError, ValueError) as e:
+        print(f"Błąd w danych: {e}", file=sys.stderr)
+        renderer.close()
+        sys.exit(1)
+    if args.draw:
+        g.draw_graph(args.draw)
+    renderer.close()
 
+if args.batch is not None:
+    batch()
+else:
+    g.load_from_file(args.file)
+    g.draw_graph("basegraph")
+    main()
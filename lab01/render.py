@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import networkx as nx
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+# Rysowanie grafu w tle: układ wierzchołków jest zapamiętywany i po małych
+# zmianach liczony od poprzednich pozycji, a zapis PNG odbywa się w osobnym
+# wątku, więc menu nie czeka na matplotlib. W trybie headless nic nie jest
+# rysowane.
+class GraphRenderer:
+    def __init__(self, headless=False, warm_iterations=10, full_iterations=50, max_new_nodes=0.1):
+        self.headless = headless
+        self.warm_iterations = warm_iterations
+        self.full_iterations = full_iterations
+        self.max_new_nodes = max_new_nodes
+        self.pos = {}
+        self.executor = None if headless else ThreadPoolExecutor(max_workers=1)
+
+    def draw(self, graph, filename):
+        if self.headless:
+            return None
+        edges = list(graph.storage.edges())
+        future = self.executor.submit(self._render, graph.num_vertices, edges, graph.directed, filename)
+        future.add_done_callback(self._report)
+        return future
+
+    # Wierzchołki o numerach większych niż v zmieniają numer po usunięciu v
+    def vertex_deleted(self, v):
+        if self.headless:
+            return
+        self.executor.submit(self._shift, v).add_done_callback(self._report)
+
+    # Błędy z wątku rysującego nie mogą zginąć po cichu
+    @staticmethod
+    def _report(future):
+        error = future.exception()
+        if error is not None:
+            print(f"Błąd podczas rysowania grafu: {error}")
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    def _shift(self, v):
+        self.pos = {(node - 1 if node > v else node): p for node, p in self.pos.items() if node != v}
+
+    def layout(self, G):
+        known = {node: self.pos[node] for node in G if node in self.pos}
+        new_nodes = len(G) - len(known)
+        if known and new_nodes <= self.max_new_nodes * len(G):
+            pos = nx.spring_layout(G, pos=known, iterations=self.warm_iterations)
+        else:
+            pos = nx.spring_layout(G, iterations=self.full_iterations)
+        self.pos = pos
+        return pos
+
+    def _render(self, num_vertices, edges, directed, filename):
+        G = nx.DiGraph() if directed else nx.Graph()
+        for i in range(num_vertices):
+            G.add_node(i+1)
+        for i, j, count in edges:
+            for _ in range(count):
+                G.add_edge(i+1, j+1)
+        pos = self.layout(G)
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        nx.draw(G, pos, ax=ax, with_labels=True, node_color='lightblue', font_weight='bold')
+        fig.savefig(f"{filename}.png")
@@ -0,0 +1,145 @@
+from collections import Counter
+
+import numpy as np
+
+
+# Gęsta macierz sąsiedztwa - dobra dla małych i gęstych grafów
+class DenseStorage:
+    def __init__(self, num_vertices=0):
+        self.rows = [[0] * num_vertices for _ in range(num_vertices)]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add_vertex(self):
+        for row in self.rows:
+            row.append(0)
+        self.rows.append([0] * (len(self.rows) + 1))
+
+    def delete_vertex(self, v):
+        self.rows.pop(v)
+        for row in self.rows:
+            row.pop(v)
+
+    def count(self, i, j):
+        return self.rows[i][j]
+
+    def change(self, i, j, delta):
+        self.rows[i][j] += delta
+
+    # Zmiana tylko dotkniętych komórek - O(k log k) dla k krawędzi
+    def add_edges(self, rows, cols):
+        n = len(self.rows)
+        keys, counts = np.unique(np.asarray(rows, dtype=np.int64) * n + cols, return_counts=True)
+        for key, c in zip(keys.tolist(), counts.tolist()):
+            self.rows[key // n][key % n] += c
+
+    def out_neighbors(self, v):
+        return [(j, c) for j, c in enumerate(self.rows[v]) if c > 0]
+
+    def in_neighbors(self, v):
+        return [(i, row[v]) for i, row in enumerate(self.rows) if row[v] > 0]
+
+    def edges(self):
+        for i, row in enumerate(self.rows):
+            for j, c in enumerate(row):
+                if c > 0:
+                    yield i, j, c
+
+    def to_matrix(self):
+        return self.rows
+
+
+# Rzadka lista sąsiedztwa (słownik liczników) - pamięć O(V + E),
+# dodanie wierzchołka w O(1)
+class SparseStorage:
+    def __init__(self, num_vertices=0):
+        self.out = [Counter() for _ in range(num_vertices)]
+        self.inn = [Counter() for _ in range(num_vertices)]
+
+    def __len__(self):
+        return len(self.out)
+
+    def add_vertex(self):
+        self.out.append(Counter())
+        self.inn.append(Counter())
+
+    def delete_vertex(self, v):
+        for j in self.out[v]:
+            del self.inn[j][v]
+        for i in self.inn[v]:
+            del self.out[i][v]
+        self.out.pop(v)
+        self.inn.pop(v)
+        # Przenumerowanie wierzchołków o numerach większych niż v
+        self.out = [self._shift(row, v) for row in self.out]
+        self.inn = [self._shift(row, v) for row in self.inn]
+
+    @staticmethod
+    def _shift(row, v):
+        if not row or max(row) < v:
+            return row
+        return Counter({(k - 1 if k > v else k): c for k, c in row.items()})
+
+    def count(self, i, j):
+        return self.out[i].get(j, 0)
+
+    def change(self, i, j, delta):
+        c = self.out[i].get(j, 0) + delta
+        if c > 0:
+            self.out[i][j] = c
+            self.inn[j][i] = c
+        else:
+            self.out[i].pop(j, None)
+            self.inn[j].pop(i, None)
+
+    def add_edges(self, rows, cols):
+        n = len(self.out)
+        keys, counts = np.unique(np.asarray(rows, dtype=np.int64) * n + cols, return_counts=True)
+        self._merge(self.out, keys // n, keys % n, counts)
+        order = np.argsort(keys % n * n + keys // n)
+        self._merge(self.inn, keys[order] % n, keys[order] // n, counts[order])
+
+    # Dodanie posortowanych według wierszy krotności do liczników
+    @staticmethod
+    def _merge(rows, first, second, counts):
+        if len(first) == 0:
+            return
+        bounds = np.flatnonzero(np.diff(first)) + 1
+        starts = np.concatenate(([0], bounds)).tolist()
+        ends = np.concatenate((bounds, [len(first)])).tolist()
+        first = first.tolist()
+        second = second.tolist()
+        counts = counts.tolist()
+        for start, end in zip(starts, ends):
+            rows[first[start]].update(dict(zip(second[start:end], counts[start:end])))
+
+    def out_neighbors(self, v):
+        return list(self.out[v].items())
+
+    def in_neighbors(self, v):
+        return list(self.inn[v].items())
+
+    def edges(self):
+        for i, row in enumerate(self.out):
+            for j, c in row.items():
+                yield i, j, c
+
+    def to_matrix(self):
+        n = len(self.out)
+        matrix = [[0] * n for _ in range(n)]
+        for i, j, c in self.edges():
+            matrix[i][j] = c
+        return matrix
+
+
+BACKENDS = {
+    "dense": DenseStorage,
+    "sparse": SparseStorage,
+}
+
+
+def make_storage(backend, num_vertices=0):
+    if backend not in BACKENDS:
+        raise ValueError(f"Nieznany sposób przechowywania grafu: {backend}. Dostępne: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](num_vertices)
@@ -0,0 +1,57 @@
+import numpy as np
+
+# 2-aproksymacja pokrycia wierzchołkowego przez skojarzenie maksymalne
+# w czasie O(V + E). Krawędzie są przeglądane w losowej (powtarzalnej dla
+# danego ziarna) kolejności; wybór pierwszej jeszcze niepokrytej krawędzi
+# odpowiada losowaniu spośród krawędzi, które pozostały w grafie.
+
+BLOCK = 1 << 16
+
+
+def adjacency_lists(edges, size):
+    adj = [[] for _ in range(size)]
+    for u, v in edges:
+        adj[u].append(v)
+        adj[v].append(u)
+    return adj
+
+
+# Krawędzie w wylosowanej kolejności; tablica (m, 2) (np. w pamięci
+# współdzielonej) czytana jest blokami, bez kopii całego grafu
+def _ordered_edges(edges, order):
+    if isinstance(edges, np.ndarray):
+        for start in range(0, len(order), BLOCK):
+            part = edges[order[start:start + BLOCK]]
+            yield from zip(part[:, 0].tolist(), part[:, 1].tolist())
+    else:
+        for index in order.tolist():
+            yield edges[index]
+
+
+# edges - lista par (u, v) numerowanych od 0 albo tablica (m, 2)
+# on_step(step, u, v, removed, cover, cover_edges) - wywoływane po wyborze
+# krawędzi; removed to krawędzie, które w tym kroku zostają pokryte
+def vertex_cover_matching(edges, size, seed=None, on_step=None):
+    order = np.random.default_rng(seed).permutation(len(edges))
+    adj = adjacency_lists(edges, size) if on_step is not None else None
+    covered = bytearray(size)
+    cover = set()
+    cover_edges = set()
+    step = 1
+
+    for u, v in _ordered_edges(edges, order):
+        if covered[u] or covered[v]:
+            continue
+        covered[u] = 1
+        covered[v] = 1
+        cover.add(u + 1)
+        cover.add(v + 1)
+        cover_edges.add((u + 1, v + 1))
+        if on_step is not None:
+            removed = [(u, v)]
+            removed.extend((u, y) for y in adj[u] if not covered[y])
+            removed.extend((v, y) for y in adj[v] if not covered[y])
+            on_step(step, u, v, removed, cover, cover_edges)
+        step += 1
+
+    return cover, cover_edges
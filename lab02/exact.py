@@ -0,0 +1,290 @@
+import argparse
+import heapq
+import math
+import time
+from collections import deque
+
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+from graphfile import load_edge_file
+
+# Dokładne pokrycie wierzchołkowe: najpierw jądro problemu (reguły dla
+# wierzchołków stopnia 0, 1 i 2 oraz redukcja Nemhausera-Trottera z
+# relaksacji liniowej), potem metoda podziału i ograniczeń z dolnym
+# ograniczeniem z maksymalnego skojarzenia i regułą wysokiego stopnia.
+
+
+def build_adjacency(edges, size):
+    adj = {v: set() for v in range(size)}
+    loops = set()
+    for u, v in edges:
+        if u == v:
+            loops.add(u)
+        else:
+            adj[u].add(v)
+            adj[v].add(u)
+    return adj, loops
+
+
+def _remove(adj, vertices):
+    return {u: ns - vertices for u, ns in adj.items() if u not in vertices}
+
+
+def _edges(adj):
+    return [(u, v) for u, ns in adj.items() for v in ns if u < v]
+
+
+def matching_lower_bound(adj):
+    matched = set()
+    size = 0
+    for u in sorted(adj, key=lambda x: len(adj[x])):
+        if u in matched:
+            continue
+        for v in adj[u]:
+            if v not in matched:
+                matched.add(u)
+                matched.add(v)
+                size += 1
+                break
+    return size
+
+
+def greedy_cover(adj):
+    degree = {v: len(ns) for v, ns in adj.items()}
+    heap = [(-d, v) for v, d in degree.items() if d > 0]
+    heapq.heapify(heap)
+    cover = set()
+    while heap:
+        d, v = heapq.heappop(heap)
+        if v in cover or -d != degree[v]:
+            continue
+        if degree[v] == 0:
+            break
+        cover.add(v)
+        for u in adj[v]:
+            if u not in cover:
+                degree[u] -= 1
+                heapq.heappush(heap, (-degree[u], u))
+    # Usunięcie zbędnych wierzchołków (wszyscy sąsiedzi już w pokryciu)
+    for v in list(cover):
+        if all(u in cover for u in adj[v]):
+            cover.remove(v)
+    return cover
+
+
+class Kernel:
+    def __init__(self, adj, forced=()):
+        self.adj = {v: set(ns) for v, ns in adj.items()}
+        self.forced = set()
+        self.folds = []
+        self.next_id = max(self.adj, default=-1) + 1
+        self.lp_value = None
+        for v in forced:
+            if v in self.adj:
+                self._take(v, None)
+
+    def _detach(self, v):
+        for u in self.adj.pop(v):
+            self.adj[u].discard(v)
+
+    def _take(self, v, queue):
+        if queue is not None:
+            queue.extend(self.adj[v])
+        self._detach(v)
+        self.forced.add(v)
+
+    # Zwinięcie wierzchołka v stopnia 2 o niesąsiadujących sąsiadach u, w
+    def _fold(self, v, u, w, queue):
+        x = self.next_id
+        self.next_id += 1
+        neighbors = (self.adj[u] | self.adj[w]) - {v}
+        for y in (v, u, w):
+            self._detach(y)
+        self.adj[x] = neighbors
+        for y in neighbors:
+            self.adj[y].add(x)
+        self.folds.append((x, v, u, w))
+        queue.extend(neighbors)
+        queue.append(x)
+
+    def degree_rules(self):
+        queue = deque(self.adj)
+        while queue:
+            v = queue.popleft()
+            if v not in self.adj:
+                continue
+            neighbors = self.adj[v]
+            if len(neighbors) == 0:
+                del self.adj[v]
+            elif len(neighbors) == 1:
+                self._take(next(iter(neighbors)), queue)
+            elif len(neighbors) == 2:
+                u, w = neighbors
+                if w in self.adj[u]:
+                    self._take(u, queue)
+                    self._take(w, queue)
+                else:
+                    self._fold(v, u, w, queue)
+
+    # Redukcja Nemhausera-Trottera: w optymalnym rozwiązaniu połówkowym
+    # relaksacji wierzchołki z x = 1 należą, a z x = 0 nie należą do
+    # pewnego minimalnego pokrycia
+    def lp_rule(self):
+        self.lp_value = None
+        vertices = list(self.adj)
+        edges = _edges(self.adj)
+        if not edges:
+            self.lp_value = 0
+            return False
+        index = {v: i for i, v in enumerate(vertices)}
+        rows = np.repeat(np.arange(len(edges)), 2)
+        cols = np.array([index[x] for e in edges for x in e])
+        A = coo_matrix((-np.ones(len(rows)), (rows, cols)), shape=(len(edges), len(vertices))).tocsr()
+        res = linprog(np.ones(len(vertices)), A_ub=A, b_ub=-np.ones(len(edges)), bounds=(0, 1), method="highs-ds")
+        if res.status != 0:
+            return False
+        x = res.x
+        if not np.all(np.isclose(x * 2, np.round(x * 2), atol=1e-6)):
+            return False
+        ones = [vertices[i] for i in np.flatnonzero(x > 0.75)]
+        zeros = [vertices[i] for i in np.flatnonzero(x < 0.25)]
+        if not ones and not zeros:
+            self.lp_value = res.fun
+            return False
+        for v in ones:
+            self._take(v, None)
+        for v in zeros:
+            if v in self.adj:
+                del self.adj[v]
+        return True
+
+    def unfold(self, cover):
+        cover = set(cover) | self.forced
+        for x, v, u, w in reversed(self.folds):
+            if x in cover:
+                cover.discard(x)
+                cover.update((u, w))
+            else:
+                cover.add(v)
+        return cover
+
+
+class BranchAndBound:
+    def __init__(self, adj, upper_cover, deadline=None):
+        self.best = set(upper_cover)
+        self.deadline = deadline
+        self.nodes = 0
+        self.complete = True
+        self.adj = adj
+
+    @staticmethod
+    def _simplify(adj, chosen):
+        while True:
+            leaves = {next(iter(ns)) for ns in adj.values() if len(ns) == 1}
+            if not leaves:
+                break
+            # Dwa liście połączone ze sobą - wystarczy jeden z nich
+            for v in list(leaves):
+                if v in leaves and len(adj[v]) == 1 and next(iter(adj[v])) in leaves:
+                    leaves.discard(v)
+            chosen = chosen | leaves
+            adj = _remove(adj, leaves)
+        adj = {v: ns for v, ns in adj.items() if ns}
+        return adj, chosen
+
+    def solve(self):
+        stack = [(self.adj, frozenset())]
+        while stack:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                self.complete = False
+                break
+            adj, chosen = stack.pop()
+            self.nodes += 1
+            adj, chosen = self._simplify(adj, chosen)
+            if not adj:
+                if len(chosen) < len(self.best):
+                    self.best = set(chosen)
+                continue
+            if len(chosen) + matching_lower_bound(adj) >= len(self.best):
+                continue
+            budget = len(self.best) - 1 - len(chosen)
+            v = max(adj, key=lambda x: len(adj[x]))
+            neighbors = adj[v]
+            if len(neighbors) <= budget:
+                stack.append((_remove(adj, neighbors | {v}), chosen | neighbors))
+            # Reguła wysokiego stopnia: jeśli deg(v) > budżet, v musi należeć
+            # do każdego lepszego pokrycia - zostaje tylko ta gałąź
+            stack.append((_remove(adj, {v}), chosen | {v}))
+        return self.best
+
+
+# edges - lista par (u, v) numerowanych od 0
+def vertex_cover_exact(edges, size, time_limit=None, use_lp=True):
+    times = {}
+    start = time.perf_counter()
+    adj, loops = build_adjacency(edges, size)
+    kernel = Kernel(adj, loops)
+    kernel.degree_rules()
+    times["reduction"] = time.perf_counter() - start
+
+    times["lp"] = 0.0
+    while use_lp:
+        start = time.perf_counter()
+        changed = kernel.lp_rule()
+        times["lp"] += time.perf_counter() - start
+        if not changed:
+            break
+        start = time.perf_counter()
+        kernel.degree_rules()
+        times["reduction"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    kernel_adj = {v: ns for v, ns in kernel.adj.items() if ns}
+    kernel_vertices = len(kernel_adj)
+    kernel_edges = sum(len(ns) for ns in kernel_adj.values()) // 2
+    offset = len(kernel.forced) + len(kernel.folds)
+    lower = matching_lower_bound(kernel_adj)
+    if kernel.lp_value is not None:
+        lower = max(lower, math.ceil(kernel.lp_value - 1e-9))
+    deadline = start + time_limit if time_limit is not None else None
+    bnb = BranchAndBound(kernel_adj, greedy_cover(kernel_adj), deadline)
+    best = bnb.solve()
+    times["branch_and_bound"] = time.perf_counter() - start
+
+    cover = kernel.unfold(best)
+    if bnb.complete:
+        lower = len(best)
+    report = {
+        "size": len(cover),
+        "lower_bound": offset + lower,
+        "gap": len(best) - lower,
+        "optimal": bnb.complete,
+        "kernel_vertices": kernel_vertices,
+        "kernel_edges": kernel_edges,
+        "forced": len(kernel.forced),
+        "folds": len(kernel.folds),
+        "nodes": bnb.nodes,
+        "times": times,
+    }
+    return {v + 1 for v in cover}, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dokładne pokrycie wierzchołkowe")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z listą krawędzi")
+    parser.add_argument("--time-limit", type=float, help="limit czasu dla metody podziału i ograniczeń [s]")
+    parser.add_argument("--no-lp", action="store_true", help="bez redukcji z relaksacji liniowej")
+    args = parser.parse_args()
+
+    data = load_edge_file(args.file, columns=2, header=False)
+    edges = [(u - 1, v - 1) for u, v in data.edges.tolist()]
+    cover, report = vertex_cover_exact(edges, data.num_vertices, args.time_limit, not args.no_lp)
+    print(f"Pokrycie wierzchołkowe: {sorted(cover)}")
+    print(f"Rozmiar pokrycia: {report['size']} (dolne ograniczenie: {report['lower_bound']}, luka: {report['gap']})")
+    print("Rozwiązanie optymalne" if report["optimal"] else "Przekroczono limit czasu - rozwiązanie może nie być optymalne")
+    print(f"Jądro: {report['kernel_vertices']} wierzchołków, {report['kernel_edges']} krawędzi "
+          f"(wymuszone: {report['forced']}, zwinięcia: {report['folds']}, węzły drzewa: {report['nodes']})")
+    for phase, seconds in report["times"].items():
+        print(f"Czas ({phase}): {seconds:.3f} s")
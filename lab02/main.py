@@ -1,6 +1,9 @@
 import matplotlib.pyplot as plt
 import networkx as nx
-import random
+import numpy as np
+from graphfile import load_edge_file
+from cover import vertex_cover_matching
+from steptrace import TraceWriter, render_trace
 
 class Graph:
     def __init__(self, matrix):
@@ -53,78 +56,54 @@ class Graph:
         plt.savefig(f"{filename}.png")
 
 def read_edges_from_file(filename):
-    edges = []
-    max_node = 0
-    
-    with open(filename, 'r') as file:
-        for line in file:
-            u, v = map(int, line.split())
-            edges.append((u - 1, v - 1))
-            max_node = max(max_node, u, v)
-
-    matrix = [[0] * max_node for _ in range(max_node)]
-    for u, v in edges:
-        matrix[u][v] = 1
-        matrix[v][u] = 1
-    
-    return matrix
-def vertex_cover_2_approx(graph):
-    cover = set()
-    cover_edges = set()
-    step = 1 
+    data = load_edge_file(filename, columns=2, header=False)
+    max_node = data.num_vertices
+    edges = np.asarray(data.edges, dtype=np.int64) - 1
 
-    print("\nEtapy działania algorytmu:")
+    matrix = np.zeros((max_node, max_node), dtype=np.int64)
+    matrix[edges[:, 0], edges[:, 1]] = 1
+    matrix[edges[:, 1], edges[:, 0]] = 1
     
+    return matrix.tolist()
+def vertex_cover_2_approx(graph, seed=None, trace_path="trace.jsonl"):
+    print("\nEtapy działania algorytmu:")
 
-    while graph.has_edges():
-        u, v = random.choice(graph.edges)
-        
-        print(f"\nEtap {step}:")
-        print(f"Wybieram krawędź: ({u+1}, {v+1})")
-
-        cover.add(u + 1)
-        cover.add(v + 1)
-        cover_edges.add((u + 1, v + 1)) 
-        print(f"Dodaję wierzchołki {u+1} i {v+1} do pokrycia")
-
-        graph.draw_graph(f"graph_step_{step}_1", cover_nodes=cover, cover_edges=cover_edges)
-        print(f"Zapisano graf po etapie {step} do pliku: graph_step_{step}_1.png")
-        graph.remove_edge(u, v)
-
-        for neighbor in range(graph.size):
-            if graph.matrix[u][neighbor] > 0:
-                graph.matrix[u][neighbor] = 0
-                graph.matrix[neighbor][u] = 0
-                graph.remove_edge(u, neighbor)
-                print(f"Usuwam krawędź incydentną: ({u+1}, {neighbor+1})")
-            if graph.matrix[v][neighbor] > 0:
-                graph.matrix[v][neighbor] = 0
-                graph.matrix[neighbor][v] = 0
-                graph.remove_edge(v, neighbor)
-                print(f"Usuwam krawędź incydentną: ({v+1}, {neighbor+1})")
-
-
-        graph.draw_graph(f"graph_step_{step}_2", cover_nodes=cover, cover_edges=cover_edges)
-        print(f"Zapisano graf po etapie {step} do pliku: graph_step_{step}_2.png")
-        
-        step += 1
+    with TraceWriter(trace_path, graph.size, graph.edges) as trace:
+        def on_step(step, u, v, removed, cover, cover_edges):
+            print(f"\nEtap {step}:")
+            print(f"Wybieram krawędź: ({u+1}, {v+1})")
+            print(f"Dodaję wierzchołki {u+1} i {v+1} do pokrycia")
+
+            for x, y in removed:
+                graph.matrix[x][y] = 0
+                graph.matrix[y][x] = 0
+                if (x, y) != (u, v):
+                    print(f"Usuwam krawędź incydentną: ({x+1}, {y+1})")
+            trace.step(step, u, v, removed)
+
+        cover, cover_edges = vertex_cover_matching(graph.edges, graph.size, seed=seed, on_step=on_step)
+    graph.edges = []
+    print(f"\nZapisano przebieg algorytmu do pliku: {trace_path}")
 
-    
     print(f"\nPokrycie wierzchołkowe: {cover}")
     print(f"Wykorzystano krawędzi: {cover_edges}")
     return cover, cover_edges
 
 
-matrix = read_edges_from_file("file.txt")
+if __name__ == "__main__":
+    matrix = read_edges_from_file("file.txt")
+
+    g = Graph(matrix)
+    print("Graf przed rozpoczęciem algorytmu:")
+    g.draw_graph("initial_graph")
 
-g = Graph(matrix)
-print("Graf przed rozpoczęciem algorytmu:")
-g.draw_graph("initial_graph")
 
+    cover, cover_edges = vertex_cover_2_approx(g)
 
-cover, cover_edges = vertex_cover_2_approx(g)
+    for filename in render_trace("trace.jsonl"):
+        print(f"Zapisano etap do pliku: {filename}")
 
-matrix1 = read_edges_from_file("file.txt")
+    matrix1 = read_edges_from_file("file.txt")
 
-g1 = Graph(matrix1)
-g1.draw_graph("final", cover_edges=cover_edges, cover_nodes=cover)
\ No newline at end of file
+    g1 = Graph(matrix1)
+    g1.draw_graph("final", cover_edges=cover_edges, cover_nodes=cover)
\ No newline at end of file
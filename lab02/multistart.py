@@ -0,0 +1,121 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from cover import vertex_cover_matching
+from graphfile import load_edge_file
+
+# Wielokrotne uruchomienie 2-aproksymacji z różnymi ziarnami w puli
+# procesów. Proces główny raz umieszcza w pamięci współdzielonej krawędzie
+# (int32) i listy sąsiedztwa w postaci CSR (początki list i sąsiedzi), a
+# procesy robocze pracują bezpośrednio na tych tablicach, bez własnych
+# kopii grafu - zadania przesyłają wyłącznie ziarno. Po każdym przebiegu
+# zbędne wierzchołki (wszyscy sąsiedzi są już w pokryciu, a wierzchołek
+# nie ma pętli) są usuwane z pokrycia.
+
+
+# Listy sąsiedztwa CSR: sąsiedzi v to neighbors[indptr[v]:indptr[v + 1]]
+def csr_adjacency(edges, size):
+    ends = np.concatenate((edges[:, 0], edges[:, 1]))
+    others = np.concatenate((edges[:, 1], edges[:, 0]))
+    neighbors = others[np.argsort(ends, kind="stable")].astype(np.int32)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=size), out=indptr[1:])
+    return indptr, neighbors
+
+
+def remove_redundant(cover, indptr, neighbors):
+    in_cover = np.zeros(len(indptr) - 1, dtype=bool)
+    in_cover[list(cover)] = True
+    degree = np.diff(indptr)
+    # Remisy rozstrzyga numer wierzchołka - wynik nie zależy od kolejności w zbiorze
+    for v in sorted(cover, key=lambda x: (degree[x], x)):
+        adjacent = neighbors[indptr[v]:indptr[v + 1]]
+        # Wierzchołek z pętlą jest jedynym, który ją pokrywa
+        if in_cover[adjacent].all() and not (adjacent == v).any():
+            in_cover[v] = False
+    return set(np.flatnonzero(in_cover).tolist())
+
+
+def run_trial(edges, size, indptr, neighbors, seed):
+    cover, cover_edges = vertex_cover_matching(edges, size, seed=seed)
+    cover = remove_redundant({v - 1 for v in cover}, indptr, neighbors)
+    return {v + 1 for v in cover}, cover_edges
+
+
+# Rozmieszczenie tablic w jednym bloku pamięci współdzielonej:
+# krawędzie (m, 2) int32, sąsiedzi (2m) int32, początki list (size + 1) int64
+def _layout(m, size):
+    neighbors_offset = 8 * m
+    indptr_offset = 16 * m
+    return neighbors_offset, indptr_offset, indptr_offset + 8 * (size + 1)
+
+
+def _views(buf, m, size):
+    neighbors_offset, indptr_offset, _ = _layout(m, size)
+    edges = np.ndarray((m, 2), dtype=np.int32, buffer=buf)
+    neighbors = np.ndarray(2 * m, dtype=np.int32, buffer=buf, offset=neighbors_offset)
+    indptr = np.ndarray(size + 1, dtype=np.int64, buffer=buf, offset=indptr_offset)
+    return edges, neighbors, indptr
+
+
+_worker = {}
+
+
+def _init_worker(name, m, size):
+    shm = shared_memory.SharedMemory(name=name)
+    # Pamięć musi pozostać otwarta, dopóki proces korzysta z tablic
+    _worker["shm"] = shm
+    _worker["edges"], _worker["neighbors"], _worker["indptr"] = _views(shm.buf, m, size)
+    _worker["size"] = size
+
+
+def _trial_size(seed):
+    cover, _ = run_trial(_worker["edges"], _worker["size"], _worker["indptr"], _worker["neighbors"], seed)
+    return len(cover), seed
+
+
+# edges - lista par (u, v) numerowanych od 0
+def multistart_vertex_cover(edges, size, trials=16, processes=None, first_seed=0):
+    if trials < 1:
+        raise ValueError("Liczba uruchomień musi być dodatnia.")
+    array = np.asarray(edges, dtype=np.int32).reshape(-1, 2)
+    m = len(array)
+    indptr, neighbors = csr_adjacency(array, size)
+    shm = shared_memory.SharedMemory(create=True, size=_layout(m, size)[2])
+    try:
+        shared_edges, shared_neighbors, shared_indptr = _views(shm.buf, m, size)
+        shared_edges[:] = array
+        shared_neighbors[:] = neighbors
+        shared_indptr[:] = indptr
+        del shared_edges, shared_neighbors, shared_indptr
+        seeds = range(first_seed, first_seed + trials)
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(shm.name, m, size)) as pool:
+            results = list(pool.map(_trial_size, seeds))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    best_size, best_seed = min(results)
+    cover, cover_edges = run_trial(array, size, indptr, neighbors, best_seed)
+    return cover, cover_edges, best_seed, [s for s, _ in results]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Najlepsze z wielu losowych uruchomień 2-aproksymacji")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z listą krawędzi")
+    parser.add_argument("--trials", type=int, default=16, help="liczba uruchomień")
+    parser.add_argument("--processes", type=int, help="liczba procesów")
+    parser.add_argument("--first-seed", type=int, default=0, help="ziarno pierwszego uruchomienia")
+    args = parser.parse_args()
+
+    data = load_edge_file(args.file, columns=2, header=False)
+    edges = (np.asarray(data.edges) - 1).tolist()
+    cover, cover_edges, seed, sizes = multistart_vertex_cover(edges, data.num_vertices, args.trials,
+                                                              args.processes, args.first_seed)
+    print(f"Rozmiary pokryć w kolejnych uruchomieniach: {sizes}")
+    print(f"Najmniejsze pokrycie ({len(cover)} wierzchołków) dla ziarna {seed}: {sorted(cover)}")
+    print(f"Wykorzystano krawędzi: {cover_edges}")
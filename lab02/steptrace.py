@@ -0,0 +1,140 @@
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+import networkx as nx
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Zapis przebiegu algorytmu pokrycia wierzchołkowego do pliku (jedna linia
+# JSON na etap) i osobne odtwarzanie go jako obrazków. Pierwsza linia
+# zawiera graf wejściowy, kolejne: wybraną krawędź, dodane wierzchołki
+# i krawędzie usunięte w danym etapie (numeracja od 1).
+
+
+class TraceWriter:
+    def __init__(self, path, size, edges):
+        self.path = path
+        self.file = open(path, "w")
+        self._write({"size": size, "edges": [[u + 1, v + 1] for u, v in edges]})
+
+    def _write(self, record):
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def step(self, step, u, v, removed):
+        self._write({
+            "step": step,
+            "edge": [u + 1, v + 1],
+            "added": [u + 1, v + 1],
+            "removed": [[x + 1, y + 1] for x, y in removed],
+        })
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path):
+    with open(path) as f:
+        header = json.loads(f.readline())
+        steps = [json.loads(line) for line in f if line.strip()]
+    return header["size"], [tuple(e) for e in header["edges"]], steps
+
+
+def parse_steps(text):
+    steps = set()
+    for part in text.split(","):
+        if "-" in part:
+            a, b = part.split("-")
+            steps.update(range(int(a), int(b) + 1))
+        elif part:
+            steps.add(int(part))
+    return steps
+
+
+_worker = {}
+
+
+def _init_worker(size, pos, edges, records):
+    _worker["size"] = size
+    _worker["pos"] = pos
+    _worker["edges"] = edges
+    _worker["records"] = records
+    _worker["applied"] = None
+
+
+# Stan po applied półkrokach: półkrok 2k dodaje wierzchołki etapu k,
+# a półkrok 2k + 1 usuwa jego krawędzie. Klatki przychodzą w kolejności
+# rosnącej, więc zwykle wystarczy dograć zmiany od poprzedniej klatki.
+def _replay(applied):
+    if _worker["applied"] is None or applied < _worker["applied"]:
+        _worker["remaining"] = {tuple(sorted(e)) for e in _worker["edges"]}
+        _worker["cover"] = set()
+        _worker["cover_edges"] = set()
+        _worker["applied"] = 0
+    records = _worker["records"]
+    for half in range(_worker["applied"], applied):
+        record = records[half // 2]
+        if half % 2 == 0:
+            _worker["cover"].update(record["added"])
+            _worker["cover_edges"].add(tuple(record["edge"]))
+        else:
+            _worker["remaining"].difference_update(tuple(sorted(e)) for e in record["removed"])
+    _worker["applied"] = applied
+
+
+def _render_frame(filename, applied):
+    _replay(applied)
+    cover_nodes = _worker["cover"]
+    cover_edges = _worker["cover_edges"]
+    G = nx.Graph()
+    G.add_nodes_from(range(1, _worker["size"] + 1))
+    G.add_edges_from(sorted(_worker["remaining"]))
+    node_colors = ['purple' if node in cover_nodes else 'lightblue' for node in G.nodes()]
+    edge_colors = ['red' if (u, v) in cover_edges or (v, u) in cover_edges else 'black' for u, v in G.edges()]
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    nx.draw(G, _worker["pos"], ax=ax, with_labels=True, node_color=node_colors, edge_color=edge_colors, font_weight='bold')
+    fig.savefig(f"{filename}.png")
+    return f"{filename}.png"
+
+
+# Odtworzenie zapisu z jednym, stałym układem wierzchołków; rysowane są
+# tylko wybrane etapy, a klatki powstają równolegle w puli procesów.
+# Klatka to tylko nazwa pliku i liczba półkroków do odtworzenia - procesy
+# rysujące odbudowują stan grafu z zapisanych zmian kolejnych etapów.
+def render_trace(path, steps=None, prefix="graph_step", processes=None, seed=0):
+    size, edges, records = read_trace(path)
+    G = nx.Graph()
+    G.add_nodes_from(range(1, size + 1))
+    G.add_edges_from(edges)
+    pos = nx.spring_layout(G, seed=seed)
+
+    frames = []
+    for k, record in enumerate(records):
+        step = record["step"]
+        if steps is None or step in steps:
+            frames.append((f"{prefix}_{step}_1", 2 * k + 1))
+            frames.append((f"{prefix}_{step}_2", 2 * k + 2))
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(size, pos, edges, records)) as pool:
+        return list(pool.map(_render_frame, *zip(*frames))) if frames else []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rysowanie etapów algorytmu z pliku z zapisem przebiegu")
+    parser.add_argument("trace", help="plik z zapisem przebiegu")
+    parser.add_argument("--steps", help="numery etapów, np. 1,3-5 (domyślnie wszystkie)")
+    parser.add_argument("--prefix", default="graph_step", help="początek nazw plików PNG")
+    parser.add_argument("--processes", type=int, help="liczba procesów rysujących")
+    args = parser.parse_args()
+    steps = parse_steps(args.steps) if args.steps else None
+    for filename in render_trace(args.trace, steps, args.prefix, args.processes):
+        print(f"Zapisano: {filename}")
@@ -0,0 +1,92 @@
+import argparse
+import gzip
+import time
+
+# Pokrycie wierzchołkowe w jednym przebiegu po pliku z krawędziami:
+# zachłanne skojarzenie maksymalne (krawędź, której oba końce są jeszcze
+# niepokryte, trafia do skojarzenia), czyli 2-aproksymacja. Pamięć to
+# tylko tablica pokrytych wierzchołków (jeden bajt na wierzchołek) -
+# macierz sąsiedztwa nie jest budowana. Pliki .gz są rozpakowywane w locie.
+
+CHUNK_SIZE = 1 << 24
+
+
+def open_edge_file(path):
+    with open(path, "rb") as f:
+        compressed = f.read(2) == b"\x1f\x8b"
+    return gzip.open(path, "rb") if compressed else open(path, "rb", buffering=CHUNK_SIZE)
+
+
+def read_edge_chunks(f, chunk_size=CHUNK_SIZE):
+    rest = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        chunk = rest + chunk
+        cut = chunk.rfind(b"\n") + 1
+        if cut == 0:
+            rest = chunk
+            continue
+        rest = chunk[cut:]
+        yield chunk[:cut]
+    if rest.strip():
+        yield rest
+
+
+def stream_vertex_cover(path, chunk_size=CHUNK_SIZE):
+    covered = bytearray(1 << 16)
+    edges = 0
+    matched = 0
+    start = time.perf_counter()
+
+    with open_edge_file(path) as f:
+        for chunk in read_edge_chunks(f, chunk_size):
+            if b"-" in chunk:
+                raise ValueError("Numery wierzchołków nie mogą być ujemne.")
+            values = chunk.split()
+            if len(values) % 2:
+                raise ValueError("Każda krawędź musi mieć 2 liczby.")
+            it = map(int, values)
+            for u, v in zip(it, it):
+                top = u if u > v else v
+                if top >= len(covered):
+                    covered.extend(bytes(max(top + 1, 2 * len(covered)) - len(covered)))
+                if not covered[u] and not covered[v]:
+                    covered[u] = 1
+                    covered[v] = 1
+                    matched += 1
+            edges += len(values) // 2
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "edges": edges,
+        "matched_edges": matched,
+        "cover_size": sum(covered),
+        "seconds": seconds,
+        "edges_per_second": edges / seconds if seconds > 0 else float("inf"),
+    }
+    return covered, stats
+
+
+def cover_vertices(covered):
+    return (v for v, c in enumerate(covered) if c)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Strumieniowe pokrycie wierzchołkowe (2-aproksymacja)")
+    parser.add_argument("file", help="plik z listą krawędzi (może być .gz)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rozmiar czytanego bloku w bajtach")
+    parser.add_argument("--output", help="plik, do którego zostaną zapisane wierzchołki pokrycia")
+    args = parser.parse_args()
+
+    covered, stats = stream_vertex_cover(args.file, args.chunk_size)
+    print(f"Przetworzono krawędzi: {stats['edges']} w {stats['seconds']:.2f} s "
+          f"({stats['edges_per_second']:.0f} krawędzi/s)")
+    print(f"Krawędzie w skojarzeniu: {stats['matched_edges']}")
+    print(f"Rozmiar pokrycia: {stats['cover_size']}")
+    if args.output:
+        with open(args.output, "w") as f:
+            for v in cover_vertices(covered):
+                f.write(f"{v}\n")
+        print(f"Zapisano pokrycie do pliku: {args.output}")
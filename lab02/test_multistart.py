@@ -0,0 +1,30 @@
+import numpy as np
+
+from multistart import csr_adjacency, multistart_vertex_cover, remove_redundant
+
+
+def _covers(cover, edges):
+    return all(u + 1 in cover or v + 1 in cover for u, v in edges)
+
+
+def test_self_loop_vertex_stays_in_cover():
+    edges = np.array([(0, 0), (0, 1), (1, 2), (1, 3)])
+    cover, _, _, _ = multistart_vertex_cover(edges, 4, trials=8, processes=1)
+    assert 1 in cover
+    assert _covers(cover, edges)
+
+
+def test_remove_redundant_keeps_loop_vertex():
+    edges = np.array([(0, 0), (0, 1)])
+    indptr, neighbors = csr_adjacency(edges, 2)
+    assert remove_redundant({0, 1}, indptr, neighbors) == {0}
+
+
+def test_random_graphs_with_loops_are_covered():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        size = int(rng.integers(2, 12))
+        edges = rng.integers(0, size, (int(rng.integers(1, 30)), 2))
+        cover, _, _, sizes = multistart_vertex_cover(edges, size, trials=4, processes=1)
+        assert _covers(cover, edges)
+        assert len(cover) == min(sizes)
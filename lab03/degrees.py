@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Jedna wspólna implementacja dla wszystkich laboratoriów - katalog common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from common.degrees import DegreeStats
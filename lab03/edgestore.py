@@ -0,0 +1,167 @@
+import math
+
+import numpy as np
+
+# Zwarta reprezentacja multigrafu: równoległe tablice końców (int32) i wag
+# (float64) krawędzi oraz incydencje w postaci CSR (początki list int64
+# i identyfikatory krawędzi int32), bez list Pythona dla wierzchołków.
+# CSR budowane jest raz i przebudowywane leniwie: krawędzie dodane po
+# ostatniej budowie są końcówką tablic przeglądaną wektorowo, dopóki nie
+# jest jej za dużo, a usunięte krawędzie są tylko oznaczane w alive.
+# Identyfikator krawędzi nie zmienia się do jej usunięcia, każda krawędź
+# równoległa ma własną wagę, a pamięć to O(V + E). Wierzchołki numerowane
+# od 0.
+
+# Najmniejsza liczba krawędzi dodanych po budowie CSR, przy której
+# następuje przebudowa
+PENDING_LIMIT = 64
+
+
+class EdgeStore:
+    def __init__(self, num_vertices=0, capacity=16):
+        self.u = np.empty(capacity, dtype=np.int32)
+        self.v = np.empty(capacity, dtype=np.int32)
+        self.w = np.empty(capacity, dtype=np.float64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.size = 0
+        self.count = 0
+        self._num_vertices = num_vertices
+        self._offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+        self._ids = np.empty(0, dtype=np.int32)
+        self._built = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def num_vertices(self):
+        return self._num_vertices
+
+    # Incydencje istniejących krawędzi o identyfikatorach < size, dla
+    # każdego wierzchołka w kolejności dodawania
+    def _build(self):
+        n = self._num_vertices
+        ids = np.flatnonzero(self.alive[:self.size]).astype(np.int32)
+        u, v = self.u[ids], self.v[ids]
+        other = u != v
+        ends = np.concatenate((u, v[other]))
+        owners = np.concatenate((ids, ids[other]))
+        order = np.lexsort((owners, ends))
+        self._ids = owners[order]
+        self._offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=n), out=self._offsets[1:])
+        self._built = self.size
+
+    # Lista identyfikatorów krawędzi incydentnych z x (kolejność dodawania)
+    def incident(self, x):
+        if self.size - self._built > max(PENDING_LIMIT, self.size >> 6):
+            self._build()
+        ids = self._ids[self._offsets[x]:self._offsets[x + 1]]
+        result = ids[self.alive[ids]].tolist()
+        if self._built < self.size:
+            u, v = self.u[self._built:self.size], self.v[self._built:self.size]
+            pending = np.flatnonzero(((u == x) | (v == x)) & self.alive[self._built:self.size])
+            result.extend((pending + self._built).tolist())
+        return result
+
+    def _reserve(self, needed):
+        capacity = len(self.u)
+        if needed <= capacity:
+            return
+        capacity = max(needed, 2 * capacity)
+        for name in ("u", "v", "w", "alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def add_vertex(self):
+        self._num_vertices += 1
+        self._offsets = np.append(self._offsets, self._offsets[-1])
+
+    def add(self, i, j, weight):
+        self._reserve(self.size + 1)
+        e = self.size
+        self.u[e] = i
+        self.v[e] = j
+        self.w[e] = weight
+        self.alive[e] = True
+        self.size += 1
+        self.count += 1
+        return e
+
+    def extend(self, us, vs, ws):
+        m = len(us)
+        self._reserve(self.size + m)
+        start = self.size
+        self.u[start:start + m] = us
+        self.v[start:start + m] = vs
+        self.w[start:start + m] = ws
+        self.alive[start:start + m] = True
+        self.size += m
+        self.count += m
+        return range(start, start + m)
+
+    def remove(self, e):
+        self.alive[e] = False
+        self.count -= 1
+
+    # Krawędź i -> j (dla grafu nieskierowanego także j -> i); bez wagi
+    # ostatnio dodana, z wagą pierwsza o tej wadze
+    def find(self, i, j, weight=None, directed=False):
+        candidates = [e for e in self.incident(i)
+                      if (self.u[e] == i and self.v[e] == j) or (not directed and self.u[e] == j and self.v[e] == i)]
+        if weight is None:
+            return candidates[-1] if candidates else None
+        for e in candidates:
+            if self.w[e] == weight:
+                return e
+        return None
+
+    def connected(self, i, j, directed=False):
+        return any((self.u[e] == i and self.v[e] == j) or (not directed and self.u[e] == j and self.v[e] == i)
+                   for e in self.incident(i))
+
+    def delete_vertex(self, v):
+        for e in self.incident(v):
+            self.remove(e)
+        u = self.u[:self.size]
+        w = self.v[:self.size]
+        u[u > v] -= 1
+        w[w > v] -= 1
+        self._num_vertices -= 1
+        self._build()
+
+    def weight(self, e):
+        w = float(self.w[e])
+        return int(w) if w.is_integer() else w
+
+    def edge(self, e):
+        return int(self.u[e]), int(self.v[e]), self.weight(e)
+
+    def ids(self):
+        return np.flatnonzero(self.alive[:self.size])
+
+    def edges(self):
+        for e in self.ids().tolist():
+            yield (e,) + self.edge(e)
+
+    def total_weight(self):
+        w = math.fsum(self.w[:self.size][self.alive[:self.size]].tolist())
+        return int(w) if w.is_integer() else w
+
+    # Listy incydencji w postaci CSR: krawędzie wierzchołka x to
+    # edge_ids[offsets[x]:offsets[x + 1]] (dla grafu skierowanego tylko
+    # krawędzie wychodzące, a z incoming tylko wchodzące)
+    def csr(self, directed=False, incoming=False):
+        ids = self.ids()
+        ends = self.v[ids] if directed and incoming else self.u[ids]
+        owners = ids
+        if not directed:
+            loops = self.u[ids] == self.v[ids]
+            ends = np.concatenate((ends, self.v[ids][~loops]))
+            owners = np.concatenate((ids, ids[~loops]))
+        order = np.argsort(ends, kind="stable")
+        offsets = np.zeros(self.num_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=self.num_vertices), out=offsets[1:])
+        return offsets, owners[order]
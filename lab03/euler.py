@@ -0,0 +1,69 @@
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# Cykl Eulera iteracyjnym algorytmem Hierholzera na identyfikatorach
+# krawędzi z EdgeStore: każda krawędź jest odwiedzana raz, więc czas to
+# O(V + E). Krawędzie trasy są zwracane generatorem w kolejności zdejmowania
+# ze stosu, dlatego cała trasa nigdy nie jest trzymana jako lista. W grafie
+# skierowanym przeszukiwanie idzie po łukach wchodzących, żeby kolejność
+# zdejmowania była kolejnością przejazdu. Wierzchołki zwracane od 1.
+
+
+def is_eulerian(edges, directed=False):
+    ids = edges.ids()
+    if len(ids) == 0:
+        return False
+    n = edges.num_vertices
+    u = edges.u[ids]
+    v = edges.v[ids]
+    if directed:
+        if np.any(np.bincount(u, minlength=n) != np.bincount(v, minlength=n)):
+            return False
+    elif np.any((np.bincount(u, minlength=n) + np.bincount(v, minlength=n)) % 2):
+        return False
+    graph = coo_matrix((np.ones(len(ids)), (u, v)), shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    used = np.union1d(u, v)
+    return bool(np.all(labels[used] == labels[used[0]]))
+
+
+# Generator krawędzi (u, v, identyfikator) cyklu Eulera zaczynającego się
+# w wierzchołku start (domyślnie pierwszym z krawędziami)
+def euler_circuit(edges, directed=False, start=None):
+    offsets, incident = edges.csr(directed, incoming=True)
+    offsets = offsets.tolist()
+    incident = incident.tolist()
+    u = edges.u[:edges.size].tolist()
+    v = edges.v[:edges.size].tolist()
+    if start is None:
+        start = u[incident[0]]
+    else:
+        start -= 1
+    ptr = offsets[:-1]
+    used = bytearray(edges.size)
+    stack = [(start, -1)]
+    while stack:
+        x, e = stack[-1]
+        p = ptr[x]
+        end = offsets[x + 1]
+        while p < end and used[incident[p]]:
+            p += 1
+        ptr[x] = p
+        if p < end:
+            f = incident[p]
+            used[f] = 1
+            y = u[f] if directed else u[f] + v[f] - x
+            stack.append((y, f))
+        else:
+            stack.pop()
+            if e >= 0:
+                yield x + 1, stack[-1][0] + 1, e
+
+
+# Trasa (generator) i jej dokładna długość - suma wag wszystkich krawędzi,
+# bo cykl Eulera przechodzi każdą dokładnie raz; None, gdy cyklu nie ma
+def eulerian_route(edges, directed=False, start=None):
+    if not is_eulerian(edges, directed):
+        return None, None
+    return euler_circuit(edges, directed, start), edges.total_weight()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Jedna wspólna implementacja dla wszystkich laboratoriów - katalog common
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from common.graphfile import (CACHE_HEADER, CHUNK_SIZE, MAGIC, VERSION, EdgeFile, cache_path,
+                              load_edge_file, parse_ints)
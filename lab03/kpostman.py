@@ -0,0 +1,153 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from main import Graph
+from euler import eulerian_route
+from paths import ShortestPaths, dijkstra
+
+# Problem k listonoszy: cykl Eulera grafu po uzupełnieniu krawędziami jest
+# dzielony na k odcinków metodą Fredericksona (progi długości przesunięte
+# o c_max - najdalszą krawędź liczoną z dojazdem z bazy i powrotem), a każdy
+# pojazd dojeżdża do swojego odcinka i wraca do bazy najkrótszą ścieżką.
+# Potem każda trasa osobno (w puli procesów) jest poprawiana: przejazdy bez
+# obsługi (krawędzie dodane przy uzupełnianiu i dojazdy) są zastępowane
+# najkrótszymi ścieżkami między kolejnymi obsługiwanymi krawędziami.
+# Wierzchołki numerowane od 1.
+
+
+def depot_distances(paths, depot, num_vertices, edges, directed):
+    dist_from, _ = paths.dijkstra(depot)
+    if not directed:
+        return dist_from, dist_from
+    reverse = ShortestPaths.from_edges(num_vertices, [(j + 1, i + 1, w) for _, i, j, w in edges.edges()], True)
+    dist_to, _ = reverse.dijkstra(depot)
+    return dist_from, dist_to
+
+
+# Odcinki trasy: listy (u, v, waga, czy obsługiwana); krawędzie o
+# identyfikatorze >= first_added są tylko przejazdami
+def frederickson_split(route, length, k, dist_from, dist_to, c_max, first_added):
+    thresholds = [j / k * (length - 2 * c_max) + c_max for j in range(1, k)]
+    segments = [[]]
+    travelled = 0
+    for u, v, e, w in route:
+        # Próg wypada na tej krawędzi - cięcie przed nią albo za nią,
+        # zależnie od tego, co daje krótszy powrót do bazy
+        while len(segments) < k and travelled + w > thresholds[len(segments) - 1]:
+            r = thresholds[len(segments) - 1] - travelled
+            if r + dist_to[u] <= w - r + dist_to[v]:
+                segments.append([])
+            else:
+                segments[-1].append((u, v, w, e < first_added))
+                segments.append([])
+                u = None
+                break
+        if u is not None:
+            segments[-1].append((u, v, w, e < first_added))
+        travelled += w
+    return segments + [[] for _ in range(k - len(segments))]
+
+
+def route_cost(depot, segment, dist_from, dist_to):
+    if not segment:
+        return 0
+    return dist_from[segment[0][0]] + sum(w for _, _, w, _ in segment) + dist_to[segment[-1][1]]
+
+
+def improve_route(adjacency, depot, segment):
+    steps = []
+    cost = 0
+    position = depot
+
+    def move(target):
+        nonlocal cost, position
+        if position == target:
+            return
+        dist, pred = dijkstra(adjacency, position, {target}, 1)
+        path = ShortestPaths.path(pred, position, target)
+        for a, b in zip(path, path[1:]):
+            steps.append((a, b, adjacency[a][b], False))
+        cost += dist[target]
+        position = target
+
+    for u, v, w, serviced in segment:
+        if serviced:
+            move(u)
+            steps.append((u, v, w, True))
+            cost += w
+            position = v
+    if steps:
+        move(depot)
+    return steps, cost
+
+
+_worker = {}
+
+
+def _init_worker(adjacency, depot):
+    _worker["adjacency"] = adjacency
+    _worker["depot"] = depot
+
+
+def _worker_improve(segment):
+    return improve_route(_worker["adjacency"], _worker["depot"], segment)
+
+
+# graph - graf po chineese_postman, first_added - rozmiar magazynu krawędzi
+# przed uzupełnieniem
+def k_postman(graph, k, depot=1, first_added=None, processes=None):
+    edges = graph.edges
+    if first_added is None:
+        first_added = edges.size
+    paths = graph.shortest_paths()
+    dist_from, dist_to = depot_distances(paths, depot, graph.num_vertices, edges, graph.directed)
+    if not edges.incident(depot - 1):
+        raise ValueError("Baza musi leżeć na którejś krawędzi.")
+    route, length = eulerian_route(edges, graph.directed, depot)
+    if route is None:
+        raise ValueError("Graf nie ma cyklu Eulera.")
+
+    c_max = max((dist_from[i + 1] + w + dist_to[j + 1]) / 2 for _, i, j, w in edges.edges())
+    weighted = ((u, v, e, edges.weight(e)) for u, v, e in route)
+    segments = frederickson_split(weighted, length, k, dist_from, dist_to, c_max, first_added)
+    split_costs = [route_cost(depot, s, dist_from, dist_to) for s in segments]
+
+    if processes is not None and processes <= 1:
+        improved = [improve_route(paths.adjacency, depot, s) for s in segments]
+    else:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(paths.adjacency, depot)) as pool:
+            improved = list(pool.map(_worker_improve, segments))
+
+    routes = [steps for steps, _ in improved]
+    costs = [cost for _, cost in improved]
+    report = {
+        "length": length,
+        "c_max": c_max,
+        "split_costs": split_costs,
+        "costs": costs,
+        "makespan": max(costs),
+        "total_cost": sum(costs),
+    }
+    return routes, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Problem k listonoszy")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("-k", type=int, default=2, help="liczba pojazdów")
+    parser.add_argument("--depot", type=int, default=1, help="wierzchołek bazy")
+    parser.add_argument("--processes", type=int, help="liczba procesów")
+    args = parser.parse_args()
+
+    g = Graph()
+    g.load_from_file(args.file)
+    first_added = g.edges.size
+    g.chineese_postman()
+    routes, report = k_postman(g, args.k, args.depot, first_added, args.processes)
+    print(f"Długość trasy jednego listonosza: {report['length']}")
+    for number, (steps, cost, split_cost) in enumerate(zip(routes, report["costs"], report["split_costs"]), 1):
+        vertices = [steps[0][0]] + [v for _, v, _, _ in steps] if steps else []
+        print(f"Trasa {number} (długość {cost}, przed poprawą {split_cost}): {vertices}")
+    print(f"Najdłuższa trasa: {report['makespan']}")
+    print(f"Łączny koszt: {report['total_cost']}")
@@ -2,33 +2,40 @@ import networkx as nx
 import matplotlib.pyplot as plt
 from matplotlib.patches import FancyArrowPatch
 from collections import defaultdict
+import numpy as np
+from degrees import DegreeStats
+from graphfile import load_edge_file
+from paths import ShortestPaths
+from edgestore import EdgeStore
+from flow import min_cost_duplication
+from matching import GAP_LIMIT, large_odd_matching
+from euler import eulerian_route
+
+# Od tylu wierzchołków nieparzystych skojarzenie liczone jest przybliżone
+LARGE_MATCHING = 1000
 
 class Graph:
     def __init__(self, directed=False):
         self.directed = directed
-        self.adj_matrix = [] 
-        self.weights_matrix = []  
+        self.edges = EdgeStore()
+        self.degrees = DegreeStats(directed)
         self.num_vertices = 0
 
     def add_vertex(self):
         self.num_vertices += 1
-        for row in self.adj_matrix:
-            row.append(0) 
-        self.adj_matrix.append([0] * self.num_vertices)  
-        # Dodajemy pustą listę dla wag
-        self.weights_matrix.append([[] for _ in range(self.num_vertices)])
+        self.edges.add_vertex()
+        self.degrees.add_vertex()
 
     def delete_vertex(self, v):
         if v < 1 or v > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return
         v -= 1
-        self.adj_matrix.pop(v)
-        self.weights_matrix.pop(v)
-        for row in self.adj_matrix:
-            row.pop(v)
-        for row in self.weights_matrix:
-            row.pop(v)
+        for e in self.edges.incident(v):
+            a, b, _ = self.edges.edge(e)
+            self.degrees.remove_edge(a, b)
+        self.degrees.pop_vertex(v)
+        self.edges.delete_vertex(v)
         self.num_vertices -= 1
 
     def add_edge(self, i, j, weight=1):
@@ -37,11 +44,31 @@ class Graph:
             return
         i -= 1
         j -= 1
-        self.adj_matrix[i][j] += 1  
-        self.weights_matrix[i][j].append(weight) 
-        if not self.directed:
-            self.adj_matrix[j][i] += 1
-            self.weights_matrix[j][i].append(weight)
+        self.edges.add(i, j, weight)
+        self.degrees.add_edge(i, j)
+
+    # Hurtowe dodanie krawędzi (tablica par i j, numeracja od 1) z wagami
+    def add_edges(self, edges, weights):
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        valid = ((edges >= 1) & (edges <= self.num_vertices)).all(axis=1)
+        if not valid.all():
+            print(f"Wierzchołek nie istnieje. Pominięto krawędzi: {len(edges) - int(valid.sum())}")
+        i = edges[valid, 0] - 1
+        j = edges[valid, 1] - 1
+        n = self.num_vertices
+        self.edges.extend(i, j, np.asarray(weights)[valid])
+        if self.directed:
+            out_degree = np.bincount(i, minlength=n)
+            in_degree = np.bincount(j, minlength=n)
+        else:
+            out_degree = np.bincount(i, minlength=n) + np.bincount(j[i != j], minlength=n)
+            in_degree = np.bincount(j, minlength=n) + np.bincount(i[i != j], minlength=n)
+        degree = np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+        self.degrees.set_degrees(
+            (in_degree + self.degrees.in_degree).tolist(),
+            (out_degree + self.degrees.out_degree).tolist(),
+            (degree + self.degrees.degree).tolist(),
+        )
 
     def delete_edge(self, i, j, weight=None):
         if i < 1 or j < 1 or i > self.num_vertices or j > self.num_vertices:
@@ -49,91 +76,44 @@ class Graph:
             return
         i -= 1
         j -= 1
-        if self.adj_matrix[i][j] == 0:
+        if not self.edges.connected(i, j, self.directed):
             print("Krawędź nie istnieje.")
             return
-        if weight is None: 
-            self.adj_matrix[i][j] -= 1
-            self.weights_matrix[i][j].pop()
-            if not self.directed:
-                self.adj_matrix[j][i] -= 1
-                self.weights_matrix[j][i].pop()
-        else: 
-            if weight in self.weights_matrix[i][j]:
-                self.weights_matrix[i][j].remove(weight)
-                self.adj_matrix[i][j] -= 1
-                if not self.directed:
-                    self.weights_matrix[j][i].remove(weight)
-                    self.adj_matrix[j][i] -= 1
-            else:
-                print("Nie znaleziono krawędzi o podanej wadze.")
+        # Bez wagi usuwana jest ostatnio dodana krawędź, z wagą - pierwsza o tej wadze
+        e = self.edges.find(i, j, weight, self.directed)
+        if e is None:
+            print("Nie znaleziono krawędzi o podanej wadze.")
+            return
+        self.edges.remove(e)
+        self.degrees.remove_edge(i, j)
 
     def vertex_degree(self, v):
         if v < 1 or v > self.num_vertices:
             print("Wierzchołek nie istnieje.")
             return 0
-        v -= 1
-        if self.directed:
-            in_degree = sum(self.adj_matrix[i][v] for i in range(self.num_vertices))
-            out_degree = sum(self.adj_matrix[v][i] for i in range(self.num_vertices))
-            return in_degree, out_degree, in_degree + out_degree
-        else:
-            return sum(self.adj_matrix[v])
+        return self.degrees.vertex_degree(v-1)
 
     def min_graph_degree(self):
-        if self.num_vertices == 0:
-            return 0
-        if not self.directed:
-            return min(self.vertex_degree(v+1) for v in range(self.num_vertices))
-        else:
-            return min(self.vertex_degree(v+1)[2] for v in range(self.num_vertices))
+        return self.degrees.min_degree()
 
     def max_graph_degree(self):
-        if self.num_vertices == 0:
-            return 0
-        if not self.directed:
-            return max(self.vertex_degree(v+1) for v in range(self.num_vertices))
-        else:
-            return max(self.vertex_degree(v+1)[2] for v in range(self.num_vertices))
+        return self.degrees.max_degree()
 
     def even_odd_degrees(self):
-        even, odd = 0, 0
-        for v in range(self.num_vertices):
-            if not self.directed:
-                if self.vertex_degree(v+1) % 2 == 0:
-                    even += 1
-                else:
-                    odd += 1
-            else:
-                _, _, sum_degree = self.vertex_degree(v+1)
-                if sum_degree % 2 == 0:
-                    even += 1
-                else: 
-                    odd += 1                
-        return even, odd
+        return self.degrees.even_odd()
 
     def sorted_vertex_degrees(self):
-        if not self.directed:
-            degrees = [self.vertex_degree(v+1) for v in range(self.num_vertices)]
-            return sorted(degrees, reverse=True)
-        else:
-            degrees = [self.vertex_degree(v+1)[2] for v in range(self.num_vertices)]
-            return sorted(degrees, reverse=True)
+        return self.degrees.sorted_desc()
 
     def draw_graph(self, filename):
         plt.clf()
         G = nx.MultiDiGraph() if self.directed else nx.MultiGraph()
-        size = len(self.adj_matrix)
 
-        for i in range(size):
+        for i in range(self.num_vertices):
             G.add_node(i + 1)
-        for i in range(size):
-            for j in range(size):
-                k = self.adj_matrix[i][j]
-                if k > 0:
-                    for edge_idx in range(k):
-                        weight = self.weights_matrix[i][j][edge_idx]
-                        G.add_edge(i + 1, j + 1, weight=weight, key=edge_idx)
+        # Klucz to numer kolejnej krawędzi równoległej (potrzebny do rozsunięcia łuków)
+        for _, i, j, weight in self.edges.edges():
+            G.add_edge(i + 1, j + 1, weight=weight, key=G.number_of_edges(i + 1, j + 1))
 
         pos = nx.spring_layout(G)
         nx.draw_networkx_nodes(G, pos, node_color='lightblue', node_size=2000)
@@ -164,42 +144,106 @@ class Graph:
 
     def load_from_file(self, filename):
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines() 
-                graph_type = lines[0].strip()
-                if graph_type == 'S':
-                    self.directed = True
-                elif graph_type == 'N':
-                    self.directed = False
-                else:
-                    raise ValueError("Nieprawidłowy typ grafu. Użyj 'S' dla skierowanego lub 'N' dla nieskierowanego.")    
-                self.num_vertices = int(lines[1].strip())
-                self.adj_matrix = [[0] * self.num_vertices for _ in range(self.num_vertices)]
-                self.weights_matrix = [[[] for _ in range(self.num_vertices)] for _ in range(self.num_vertices)]
-                for line in lines[2:]:
-                    i, j, w = map(int, line.split())
-                    self.add_edge(i, j, w)
-        
+            data = load_edge_file(filename, columns=3)
+            if data.kind == 'S':
+                self.directed = True
+            elif data.kind == 'N':
+                self.directed = False
+            else:
+                raise ValueError("Nieprawidłowy typ grafu. Użyj 'S' dla skierowanego lub 'N' dla nieskierowanego.")
+            self.num_vertices = data.num_vertices
+            self.edges = EdgeStore(self.num_vertices)
+            self.degrees = DegreeStats(self.directed, self.num_vertices)
+            self.add_edges(data.edges, data.weights)
+
         except FileNotFoundError:
             print("Plik nie został znaleziony.")
         except ValueError as ve:
             print(f"Błąd w danych: {ve}")
 
+    # Gęste macierze sąsiedztwa i wag - tylko do wyświetlania
+    def matrices(self):
+        n = self.num_vertices
+        adj_matrix = [[0] * n for _ in range(n)]
+        weights_matrix = [[[] for _ in range(n)] for _ in range(n)]
+        for _, i, j, weight in self.edges.edges():
+            adj_matrix[i][j] += 1
+            weights_matrix[i][j].append(weight)
+            if not self.directed:
+                adj_matrix[j][i] += 1
+                weights_matrix[j][i].append(weight)
+        return adj_matrix, weights_matrix
+
     def display_matrices(self):
+        adj_matrix, weights_matrix = self.matrices()
         print("Macierz sąsiedztwa:")
-        for row in self.adj_matrix:
+        for row in adj_matrix:
             print(row)
         print("\nMacierz wag:")
-        for row in self.weights_matrix:
+        for row in weights_matrix:
             print(["; ".join(map(str, cell)) if cell else "[]" for cell in row])
 
-    def chineese_postman(self):
+    def shortest_paths(self):
+        edges = [(i+1, j+1, w) for _, i, j, w in self.edges.edges()]
+        return ShortestPaths.from_edges(self.num_vertices, edges, self.directed)
+
+    # Graf skierowany: łuki dublowane według przepływu o minimalnym koszcie
+    # między wierzchołkami z nadmiarem i niedoborem wyjść
+    def directed_postman(self):
+        ids = self.edges.ids()
+        u = self.edges.u[ids]
+        v = self.edges.v[ids]
+        w = self.edges.w[ids]
+        try:
+            x, cost = min_cost_duplication(self.num_vertices, u, v, w)
+        except ValueError as ve:
+            print(ve)
+            return self.edges
+        used = x > 0
+        arcs = np.repeat(np.column_stack((u[used], v[used])) + 1, x[used], axis=0)
+        self.add_edges(arcs, np.repeat(w[used], x[used]))
+        print(f"Dodano łuków: {len(arcs)} o łącznej wadze {int(cost) if cost.is_integer() else cost}")
+        return self.edges
+
+    # Duże instancje: kandydaci do skojarzenia to tylko k najbliższych
+    # wierzchołków nieparzystych, bez pełnego grafu i rysunków
+    def large_postman(self, paths, W, k=8, processes=1, gap_limit=GAP_LIMIT):
+        pairs, path, report = large_odd_matching(paths, W, k=k, gap_limit=gap_limit, processes=processes)
+        print(f"Przybliżone skojarzenie: koszt {report['cost']} (po etapie zachłannym: {report['greedy_cost']}, "
+              f"zamiany par: {report['swaps']}, składowe skojarzone dokładnie: {report['exact_components']})")
+        if report["gap"] is not None:
+            print(f"Koszt optymalnego skojarzenia: {report['exact_cost']}, różnica: {report['gap']}")
+        else:
+            print(f"Pominięto koszt optymalnego skojarzenia: {report['odd']} wierzchołków nieparzystych "
+                  f"(limit {report['gap_limit']})")
+        if report["unmatched"]:
+            print(f"Wierzchołki bez pary: {report['unmatched']}")
+        added = []
+        weights = []
+        for u, v in pairs:
+            shortest_path = path(u, v)
+            for start, end in zip(shortest_path, shortest_path[1:]):
+                added.append((start, end))
+                weights.append(paths.weight(start, end))
+        self.add_edges(np.array(added, dtype=np.int64).reshape(-1, 2), weights)
+        print(f"Dodano krawędzi: {len(added)}")
+        return self.edges
+
+    def chineese_postman(self, processes=1, large=None, k=8, gap_limit=GAP_LIMIT):
+        if self.directed:
+            return self.directed_postman()
+
         # Zidentyfikuj wierszchołki nieparzystego stopnia w grafie G.
         W = []
         for v in range(self.num_vertices):
             if not self.directed:
                 if self.vertex_degree(v+1) % 2 != 0:
                     W.append(v+1)
+        if large is None:
+            large = len(W) > LARGE_MATCHING
+        if large:
+            print(f"Liczba wierzchołków o nieparzystym stopniu: {len(W)}")
+            return self.large_postman(self.shortest_paths(), W, k, processes, gap_limit)
         print(f"Wierszchołki o nieparzystym stopniu to: {W}")
 
         # Skonstruuj pełny graf na podstawie wierzchołków W
@@ -210,14 +254,15 @@ class Graph:
         for vertex in W:
             G_full.add_node(vertex)
 
-        shortest_paths_list = [] # u, v, shortest_path
+        # Jeden algorytm Dijkstry z każdego wierzchołka z W
+        paths = self.shortest_paths()
+        trees = paths.trees(W, processes=processes)
         for i in range(len(W)):
             for j in range(i + 1, len(W)):
                 u, v = W[i], W[j]
-                shortest_path = nx.shortest_path(self.to_networkx(), source=u, target=v, weight='weight')
-                shortest_path_length = nx.shortest_path_length(self.to_networkx(), source=u, target=v, weight='weight')
-                shortest_paths_list.append((u, v, shortest_path))
-                G_full.add_edge(u, v, weight=shortest_path_length)
+                dist, _ = trees[u]
+                if v in dist:
+                    G_full.add_edge(u, v, weight=dist[v])
 
 
         plt.clf()
@@ -250,68 +295,44 @@ class Graph:
         # które odpowiadają najkrótszej ścieżce opdpowiadającej e
 
         for u, v in matching:
-            for element in shortest_paths_list:
-                if (element[0] == u and element[1] == v) or (element[0] == v and element[1] == u):
-                    shortest_path = element[2]
-                    print(f"Dodawanie krawędzi dla najkrótszej ścieżki {shortest_path} odpowiadającej {u}-{v}")
-                    for i in range(len(shortest_path) - 1):
-                        start = shortest_path[i]
-                        end = shortest_path[i + 1]
-                        weight = self.to_networkx().edges[start, end]['weight']
-                        self.add_edge(start, end, weight=weight)
-                        print(f"Dodano krawędź: {start} -> {end} o wadze {weight}")
-        G_E = self.to_networkx()
+            _, pred = trees[u]
+            shortest_path = ShortestPaths.path(pred, u, v)
+            print(f"Dodawanie krawędzi dla najkrótszej ścieżki {shortest_path} odpowiadającej {u}-{v}")
+            for i in range(len(shortest_path) - 1):
+                start = shortest_path[i]
+                end = shortest_path[i + 1]
+                weight = paths.weight(start, end)
+                self.add_edge(start, end, weight=weight)
+                print(f"Dodano krawędź: {start} -> {end} o wadze {weight}")
         plt.clf()
         self.draw_graph("augmented_graph")
         print("Zapisano graf z dodatkowymi krawędziami do pliku augmented_graph.png")
-        return self.adj_matrix, self.weights_matrix
+        return self.edges
 
+    # Multigraf networkx: kluczem krawędzi jest jej identyfikator w magazynie
     def to_networkx(self):
-        G = nx.Graph()
-        for i in range(self.num_vertices):
-            for j in range(self.num_vertices):
-                if self.adj_matrix[i][j] > 0:
-                    weight = self.weights_matrix[i][j][0]
-                    G.add_edge(i+1, j+1, weight=weight)
+        G = nx.MultiDiGraph() if self.directed else nx.MultiGraph()
+        for e, i, j, weight in self.edges.edges():
+            G.add_edge(i+1, j+1, key=e, weight=weight)
         return G
 
 
 
-g = Graph()
-g.load_from_file("file.txt")
-g.draw_graph("basegraph")
-adjMatrix, wMatrix = g.chineese_postman()
-
-
-def find_eulerian_cycle(graph):
-    G = nx.MultiGraph()
-    for i in range(len(graph)):
-        for j in range(i + 1, len(graph)):
-            if graph[i][j] > 0:
-                for _ in range(graph[i][j]):
-                    G.add_edge(i, j)
+if __name__ == "__main__":
+    g = Graph()
+    g.load_from_file("file.txt")
+    g.draw_graph("basegraph")
+    edges = g.chineese_postman()
 
-    if nx.is_eulerian(G):
-        cycle = list(nx.eulerian_circuit(G))
-        return cycle
+    route, length = eulerian_route(edges, g.directed)
+    print("Cykl listonosza:")
+    if route is not None:
+        for u, v, _ in route:
+            print(f"({u}, {v})", end=" ")
+        print()
+        print(f"Długość trasy: {length}")
     else:
-        return None
-
-cycle = find_eulerian_cycle(adjMatrix)
-print("Cykl listonosza:")
-if cycle:
-    for u, v in cycle:
-        print(f"({u+1}, {v+1})", end=" ")
-    print()
-else:
-    print("Graf nie ma cyklu Eulera")
-
-
-sumw= 0
-for i, j in cycle:
-    sumw += wMatrix[i][j][0]
-    
-print(f"Długość trasy: {sumw}")
+        print("Graf nie ma cyklu Eulera")
 
 
 
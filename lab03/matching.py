@@ -0,0 +1,183 @@
+import networkx as nx
+
+from paths import ShortestPaths
+
+# Skojarzenie wierzchołków nieparzystych dla dużych instancji problemu
+# listonosza. Zamiast pełnego grafu na wszystkich wierzchołkach
+# nieparzystych brane są pod uwagę tylko krawędzie do k najbliższych
+# wierzchołków nieparzystych (ograniczony algorytm Dijkstry). Małe
+# składowe tego grafu są kojarzone dokładnie (algorytm kwiatowy), reszta
+# zachłannie, a potem poprawiana zamianami par (2-opt). Wierzchołki, które
+# zostały bez pary, kojarzone są z najbliższym wolnym wierzchołkiem.
+# Graf nieskierowany, wierzchołki numerowane od 1.
+
+
+class OddMatching:
+    def __init__(self, paths, odd, k=8, processes=1):
+        self.paths = paths
+        self.odd = list(odd)
+        self.k = k
+        self.processes = processes
+        self.trees = paths.trees(self.odd, processes, targets=set(self.odd), limit=k)
+        self.extra = {}
+
+    def _tree(self, u, v):
+        for s, t in ((u, v), (v, u)):
+            for trees in (self.trees, self.extra):
+                if s in trees and t in trees[s][0]:
+                    return s, trees[s]
+        return None, None
+
+    def distance(self, u, v):
+        s, tree = self._tree(u, v)
+        if tree is None:
+            return None
+        return tree[0][v if s == u else u]
+
+    def path(self, u, v):
+        s, tree = self._tree(u, v)
+        if s == u:
+            return ShortestPaths.path(tree[1], u, v)
+        return ShortestPaths.path(tree[1], v, u)[::-1]
+
+    def candidates(self):
+        edges = {}
+        for u in self.odd:
+            for v, d in self.trees[u][0].items():
+                if v != u and v in self.trees:
+                    key = (u, v) if u < v else (v, u)
+                    edges[key] = min(d, edges.get(key, d))
+        return edges
+
+    def exact(self, vertices):
+        vertices = set(vertices)
+        full = self.paths.trees(vertices, self.processes, targets=vertices, limit=len(vertices) - 1)
+        self.trees.update(full)
+        G = nx.Graph()
+        for u in vertices:
+            for v in vertices:
+                if u < v and v in full[u][0]:
+                    G.add_edge(u, v, weight=full[u][0][v])
+        return nx.algorithms.matching.min_weight_matching(G, weight="weight")
+
+    def greedy(self, edges, mate):
+        for (u, v), _ in sorted(edges.items(), key=lambda item: item[1]):
+            if u not in mate and v not in mate:
+                mate[u] = v
+                mate[v] = u
+
+    # Wolny wierzchołek dostaje najbliższy wolny wierzchołek nieparzysty
+    def match_leftovers(self, mate):
+        free = {v for v in self.odd if v not in mate}
+        for u in self.odd:
+            if u not in free:
+                continue
+            free.discard(u)
+            dist, pred = self.paths.dijkstra(u, free, 1)
+            found = [v for v in dist if v in free]
+            if not found:
+                continue
+            v = found[0]
+            self.extra[u] = (dist, pred)
+            free.discard(v)
+            mate[u] = v
+            mate[v] = u
+
+    # Zamiana par (a, b), (c, d) na (a, c), (b, d), gdy skraca to sumę
+    def improve(self, mate, neighbors, max_passes=20):
+        swaps = 0
+        for _ in range(max_passes):
+            improved = False
+            for a in self.odd:
+                if a not in mate:
+                    continue
+                for c in neighbors.get(a, ()):
+                    b = mate[a]
+                    d = mate.get(c)
+                    if d is None or c == b:
+                        continue
+                    bd = self.distance(b, d)
+                    if bd is None:
+                        continue
+                    delta = self.distance(a, c) + bd - self.distance(a, b) - self.distance(c, d)
+                    if delta < 0:
+                        mate[a], mate[c] = c, a
+                        mate[b], mate[d] = d, b
+                        swaps += 1
+                        improved = True
+            if not improved:
+                break
+        return swaps
+
+    def cost(self, pairs):
+        return sum(self.distance(u, v) for u, v in pairs)
+
+    def solve(self, exact_limit=64):
+        edges = self.candidates()
+        G = nx.Graph()
+        G.add_nodes_from(self.odd)
+        G.add_edges_from(edges)
+
+        mate = {}
+        exact_components = 0
+        for component in nx.connected_components(G):
+            if len(component) % 2 == 0 and len(component) <= exact_limit:
+                for u, v in self.exact(component):
+                    mate[u] = v
+                    mate[v] = u
+                exact_components += 1
+
+        self.greedy({e: d for e, d in edges.items() if e[0] not in mate and e[1] not in mate}, mate)
+        greedy_pairs = _pairs(mate)
+        self.match_leftovers(mate)
+        # Koszt pełnego skojarzenia przed poprawą zamianami par
+        greedy_cost = self.cost(_pairs(mate))
+        neighbors = {u: list(G[u]) for u in self.odd}
+        swaps = self.improve(mate, neighbors)
+
+        pairs = _pairs(mate)
+        report = {
+            "odd": len(self.odd),
+            "candidate_edges": len(edges),
+            "exact_components": exact_components,
+            "greedy_cost": greedy_cost,
+            "leftovers": len(pairs) - len(greedy_pairs),
+            "swaps": swaps,
+            "cost": self.cost(pairs),
+            "unmatched": len(self.odd) - 2 * len(pairs),
+        }
+        return pairs, report
+
+
+def _pairs(mate):
+    return [(u, v) for u, v in mate.items() if u < v]
+
+
+# Koszt optymalnego skojarzenia na pełnym grafie odległości (do porównania)
+def exact_matching_cost(paths, odd, processes=1):
+    odd = list(odd)
+    trees = paths.trees(odd, processes)
+    G = nx.Graph()
+    for i, u in enumerate(odd):
+        for v in odd[i + 1:]:
+            if v in trees[u][0]:
+                G.add_edge(u, v, weight=trees[u][0][v])
+    matching = nx.algorithms.matching.min_weight_matching(G, weight="weight")
+    return sum(trees[u][0][v] for u, v in matching)
+
+
+# gap_limit - do tylu wierzchołków nieparzystych liczony jest też koszt
+# optymalnego skojarzenia (różnica względem przybliżenia)
+GAP_LIMIT = 2000
+
+
+def large_odd_matching(paths, odd, k=8, exact_limit=64, gap_limit=GAP_LIMIT, processes=1):
+    solver = OddMatching(paths, odd, k, processes)
+    pairs, report = solver.solve(exact_limit)
+    report["exact_cost"] = None
+    report["gap"] = None
+    report["gap_limit"] = gap_limit
+    if len(solver.odd) <= gap_limit:
+        report["exact_cost"] = exact_matching_cost(paths, solver.odd, processes)
+        report["gap"] = report["cost"] - report["exact_cost"]
+    return pairs, solver.path, report
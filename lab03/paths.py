@@ -0,0 +1,92 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+# Najkrótsze ścieżki dla problemu listonosza: ważona lista sąsiedztwa jest
+# budowana raz (dla krawędzi wielokrotnych liczy się najlżejsza), a z każdego
+# wierzchołka źródłowego uruchamiany jest jeden algorytm Dijkstry, który
+# zwraca odległości i drzewo poprzedników. Ścieżki są odtwarzane z drzewa
+# tylko dla potrzebnych par. Wierzchołki numerowane od 1.
+
+
+class ShortestPaths:
+    def __init__(self, adjacency):
+        self.adjacency = adjacency
+
+    @classmethod
+    def from_edges(cls, num_vertices, edges, directed=False):
+        adjacency = {v: {} for v in range(1, num_vertices + 1)}
+        for u, v, w in edges:
+            if w < adjacency[u].get(v, float("inf")):
+                adjacency[u][v] = w
+            if not directed and w < adjacency[v].get(u, float("inf")):
+                adjacency[v][u] = w
+        return cls(adjacency)
+
+    def weight(self, u, v):
+        return self.adjacency[u][v]
+
+    def dijkstra(self, source, targets=None, limit=None):
+        return dijkstra(self.adjacency, source, targets, limit)
+
+    # Drzewa najkrótszych ścieżek z podanych źródeł; dla processes > 1
+    # obliczenia idą w puli procesów, które dostają graf tylko raz.
+    # Z targets i limit każde drzewo kończy się po osiągnięciu limit
+    # najbliższych wierzchołków docelowych
+    def trees(self, sources, processes=1, targets=None, limit=None):
+        sources = list(sources)
+        if (processes is not None and processes <= 1) or len(sources) < 2:
+            return {s: self.dijkstra(s, targets, limit) for s in sources}
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(self.adjacency, targets, limit)) as pool:
+            return dict(zip(sources, pool.map(_worker_dijkstra, sources, chunksize=64)))
+
+    @staticmethod
+    def path(pred, source, target):
+        path = [target]
+        while path[-1] != source:
+            path.append(pred[path[-1]])
+        path.reverse()
+        return path
+
+
+# Z targets i limit przeszukiwanie kończy się po ustaleniu odległości do
+# limit wierzchołków z targets (poza źródłem); zwracane są wtedy tylko
+# ostateczne odległości
+def dijkstra(adjacency, source, targets=None, limit=None):
+    dist = {source: 0}
+    pred = {}
+    heap = [(0, source)]
+    done = set()
+    found = 0
+    while heap:
+        d, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        if limit is not None and u != source and u in targets:
+            found += 1
+            if found >= limit:
+                break
+        for v, w in adjacency[u].items():
+            nd = d + w
+            if nd < dist.get(v, float("inf")):
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    if limit is not None:
+        dist = {v: dist[v] for v in done}
+        pred = {v: pred[v] for v in done if v != source}
+    return dist, pred
+
+
+_worker = {}
+
+
+def _init_worker(adjacency, targets=None, limit=None):
+    _worker["adjacency"] = adjacency
+    _worker["targets"] = targets
+    _worker["limit"] = limit
+
+
+def _worker_dijkstra(source):
+    return dijkstra(_worker["adjacency"], source, _worker["targets"], _worker["limit"])
@@ -0,0 +1,83 @@
+import itertools
+import random
+
+import networkx as nx
+import numpy as np
+
+from main import Graph
+from matching import exact_matching_cost, large_odd_matching
+from paths import ShortestPaths
+
+
+def _random_graph(seed, n=14, extra=10):
+    rng = random.Random(seed)
+    edges = [(v, v + 1, rng.randint(1, 9)) for v in range(1, n)]
+    for _ in range(extra):
+        u, v = rng.sample(range(1, n + 1), 2)
+        edges.append((u, v, rng.randint(1, 9)))
+    return n, edges
+
+
+def _odd(n, edges):
+    degree = [0] * (n + 1)
+    for u, v, _ in edges:
+        degree[u] += 1
+        degree[v] += 1
+    return [v for v in range(1, n + 1) if degree[v] % 2]
+
+
+# Koszt optymalnego skojarzenia przez sprawdzenie wszystkich skojarzeń
+def _brute_force(n, edges, odd):
+    G = nx.Graph()
+    for u, v, w in edges:
+        if not G.has_edge(u, v) or G[u][v]["weight"] > w:
+            G.add_edge(u, v, weight=w)
+    dist = dict(nx.all_pairs_dijkstra_path_length(G))
+
+    def best(rest):
+        if not rest:
+            return 0
+        u = rest[0]
+        return min(dist[u][v] + best(rest[1:i] + rest[i + 1:]) for i, v in enumerate(rest) if i > 0)
+    return best(tuple(odd))
+
+
+def test_exact_cost_matches_brute_force():
+    for seed in range(10):
+        n, edges = _random_graph(seed)
+        odd = _odd(n, edges)
+        paths = ShortestPaths.from_edges(n, edges)
+        assert exact_matching_cost(paths, odd) == _brute_force(n, edges, odd)
+
+
+def test_large_matching_is_perfect_and_not_below_optimum():
+    for seed in range(10):
+        n, edges = _random_graph(seed)
+        odd = _odd(n, edges)
+        paths = ShortestPaths.from_edges(n, edges)
+        pairs, path, report = large_odd_matching(paths, odd, k=3, exact_limit=0)
+        assert sorted(itertools.chain(*pairs)) == sorted(odd)
+        assert report["unmatched"] == 0
+        assert report["cost"] >= report["exact_cost"] == _brute_force(n, edges, odd)
+        assert report["gap"] == report["cost"] - report["exact_cost"]
+        assert report["greedy_cost"] >= report["cost"]
+        for u, v in pairs:
+            route = path(u, v)
+            assert route[0] == u and route[-1] == v
+
+
+def test_gap_skipped_above_limit():
+    n, edges = _random_graph(0)
+    paths = ShortestPaths.from_edges(n, edges)
+    _, _, report = large_odd_matching(paths, _odd(n, edges), gap_limit=0)
+    assert report["gap"] is None and report["exact_cost"] is None
+
+
+def test_postman_reports_skipped_gap(capsys):
+    n, edges = _random_graph(1)
+    g = Graph()
+    for _ in range(n):
+        g.add_vertex()
+    g.add_edges(np.array([(u, v) for u, v, _ in edges]), [w for _, _, w in edges])
+    g.chineese_postman(large=True, gap_limit=0)
+    assert "Pominięto koszt optymalnego skojarzenia" in capsys.readouterr().out
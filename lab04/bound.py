@@ -0,0 +1,198 @@
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import breadth_first_order, minimum_spanning_tree
+
+from dense import christofides_dense, nearest_candidates, prim, shortcut, tour_length
+from distfile import load_matrix
+from localsearch import improve_tour
+
+# Dolne ograniczenie Helda-Karpa: 1-drzewo (MST bez wierzchołka
+# specjalnego plus jego dwie najtańsze krawędzie) dla kosztów
+# D[i, j] + p[i] + p[j], minus 2 * suma kar, jest nie większe od długości
+# każdego cyklu Hamiltona. Kary p poprawia metoda subgradientowa
+# (p += krok * (stopień - 2)). Iteracje liczą 1-drzewo na rzadkim grafie
+# kandydatów, a ostateczna wartość dla najlepszych kar jest liczona
+# algorytmem Prima na pełnej macierzy, więc jest poprawnym ograniczeniem.
+# Na koniec alfa-bliskość (koszt krawędzi minus największa krawędź na
+# ścieżce w 1-drzewie) wybiera listy kandydatów do poprawy trasy.
+
+
+class OneTreeBound:
+    def __init__(self, D, k=10, pool=None):
+        self.D = D
+        self.n = len(D)
+        pool = pool or 2 * k
+        self.k = k
+        self.near = nearest_candidates(D, range(self.n), min(pool, self.n - 1))
+        mst = prim(D)
+        # Wierzchołek specjalny to liść MST - reszta grafu kandydatów
+        # pozostaje spójna po jego usunięciu
+        degree = np.bincount(mst[mst >= 0], minlength=self.n) + (mst >= 0)
+        self.special = int(np.flatnonzero(degree == 1)[0])
+        u = np.concatenate((np.repeat(np.arange(self.n), self.near.shape[1]), np.flatnonzero(mst >= 0)))
+        v = np.concatenate((self.near.ravel(), mst[mst >= 0]))
+        pairs = np.unique(np.sort(np.column_stack((u, v)), axis=1), axis=0)
+        self.u, self.v = pairs[:, 0], pairs[:, 1]
+        self.w = np.asarray(D[self.u, self.v], dtype=np.float64)
+        self.penalties = np.zeros(self.n)
+        self.value = -np.inf
+        self.iterations = 0
+
+    # 1-drzewo na grafie kandydatów: (wartość, stopnie, rodzice drzewa
+    # bez wierzchołka specjalnego, dwaj sąsiedzi wierzchołka specjalnego)
+    def sparse_one_tree(self, p):
+        s = self.special
+        cost = self.w + p[self.u] + p[self.v]
+        inner = (self.u != s) & (self.v != s)
+        shifted = cost[inner] - cost[inner].min() + 1
+        graph = coo_matrix((shifted, (self.u[inner], self.v[inner])), shape=(self.n, self.n))
+        tree = minimum_spanning_tree(graph).tocoo()
+        row, col = tree.row, tree.col
+        total = cost[inner].min() * len(row) - len(row) + tree.data.sum()
+
+        edges = np.flatnonzero(~inner)
+        ends = np.where(self.u[edges] == s, self.v[edges], self.u[edges])
+        order = np.argsort(cost[edges])[:2]
+        total += cost[edges][order].sum()
+        degree = np.bincount(np.concatenate((row, col, ends[order])), minlength=self.n)
+        degree[s] += 2
+        return total - 2 * p.sum(), degree, (row, col), ends[order]
+
+    # Wartość 1-drzewa na pełnej macierzy (poprawne ograniczenie dolne)
+    def dense_one_tree(self, p):
+        s = self.special
+        parent = prim(self.D, p, skip=s)
+        inner = np.flatnonzero(parent >= 0)
+        total = float((np.asarray(self.D[inner, parent[inner]]) + p[inner] + p[parent[inner]]).sum())
+        row = np.asarray(self.D[s], dtype=np.float64) + p + p[s]
+        row[s] = np.inf
+        total += np.sort(row)[:2].sum()
+        return total - 2 * p.sum()
+
+    def optimize(self, upper_bound, iterations=100, period=5):
+        p = np.zeros(self.n)
+        best = -np.inf
+        best_p = p.copy()
+        step_factor = 1.0
+        since = 0
+        for it in range(iterations):
+            value, degree, _, _ = self.sparse_one_tree(p)
+            self.iterations = it + 1
+            if value > best + 1e-12:
+                best = value
+                best_p = p.copy()
+                since = 0
+            else:
+                since += 1
+                if since >= period:
+                    step_factor /= 2
+                    since = 0
+            g = degree - 2
+            norm = float(g @ g)
+            if norm == 0 or step_factor < 1e-6 or upper_bound - value <= 1e-9 * abs(upper_bound):
+                break
+            p = p + step_factor * (upper_bound - value) / norm * g
+        self.penalties = best_p
+        self.value = float(self.dense_one_tree(best_p))
+        return self.value
+
+    # Alfa-bliskość dla par z puli najbliższych sąsiadów; zwraca listy
+    # k kandydatów o najmniejszym alfa (przy remisie bliższych)
+    def alpha_candidates(self, k=None):
+        k = k or self.k
+        n, s, p = self.n, self.special, self.penalties
+        _, _, (row, col), special_ends = self.sparse_one_tree(p)
+        cost = np.asarray(self.D[row, col], dtype=np.float64) + p[row] + p[col]
+        graph = coo_matrix((np.ones(len(row)), (row, col)), shape=(n, n)).tocsr()
+        graph = graph + graph.T
+        root = 0 if s != 0 else 1
+        order, parent = breadth_first_order(graph, root, directed=False, return_predecessors=True)
+        parent = np.where(parent < 0, np.arange(n), parent)
+        weight = np.zeros(n)
+        lookup = {}
+        for a, b, c in zip(row.tolist(), col.tolist(), cost.tolist()):
+            lookup[(a, b)] = lookup[(b, a)] = c
+        for v in order[1:].tolist():
+            weight[v] = lookup[(v, int(parent[v]))]
+        depth = np.zeros(n, dtype=np.int64)
+        for v in order[1:].tolist():
+            depth[v] = depth[parent[v]] + 1
+
+        a = np.repeat(np.arange(n), self.near.shape[1])
+        b = self.near.ravel()
+        beta = _path_max(parent, weight, depth, a, b)
+        # Krawędzie wierzchołka specjalnego porównywane są z jego
+        # droższą krawędzią w 1-drzewie
+        second = np.max(np.asarray(self.D[s, special_ends], dtype=np.float64) + p[special_ends] + p[s])
+        beta[(a == s) | (b == s)] = second
+        alpha = np.asarray(self.D[a, b], dtype=np.float64) + p[a] + p[b] - beta
+        alpha = np.maximum(alpha, 0).reshape(n, -1)
+        order = np.lexsort((np.asarray(self.D[a, b]).reshape(n, -1), alpha), axis=1)[:, :k]
+        return np.take_along_axis(self.near, order, axis=1)
+
+
+# Największa waga krawędzi na ścieżce a-b w drzewie (podnoszenie binarne)
+def _path_max(parent, weight, depth, a, b):
+    levels = max(1, int(depth.max()).bit_length())
+    up = [parent]
+    best = [weight]
+    for _ in range(levels - 1):
+        up.append(up[-1][up[-1]])
+        best.append(np.maximum(best[-1], best[-1][up[-2]]))
+    a = a.copy()
+    b = b.copy()
+    result = np.zeros(len(a))
+    swap = depth[a] < depth[b]
+    a[swap], b[swap] = b[swap], a[swap]
+    diff = depth[a] - depth[b]
+    for level in range(levels):
+        move = (diff >> level) & 1 == 1
+        result[move] = np.maximum(result[move], best[level][a[move]])
+        a[move] = up[level][a[move]]
+    for level in reversed(range(levels)):
+        move = up[level][a] != up[level][b]
+        result[move] = np.maximum(result[move], np.maximum(best[level][a[move]], best[level][b[move]]))
+        a[move] = up[level][a[move]]
+        b[move] = up[level][b[move]]
+    last = a != b
+    result[last] = np.maximum(result[last], np.maximum(weight[a[last]], weight[b[last]]))
+    return result
+
+
+def held_karp_bound(D, tour_cost, k=10, iterations=100):
+    if len(D) < 3:
+        return None, {"bound": tour_cost, "tour": tour_cost, "gap": 0.0, "iterations": 0}
+    bound = OneTreeBound(D, k)
+    value = bound.optimize(tour_cost, iterations)
+    report = {
+        "bound": value,
+        "tour": tour_cost,
+        "gap": (tour_cost - value) / value if value > 0 else None,
+        "iterations": bound.iterations,
+    }
+    return bound, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trasa Christofidesa i dolne ograniczenie Helda-Karpa")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("-k", type=int, default=10, help="liczba kandydatów na wierzchołek")
+    parser.add_argument("--iterations", type=int, default=100, help="liczba iteracji metody subgradientowej")
+    args = parser.parse_args()
+
+    D = load_matrix(args.file)
+    start = time.perf_counter()
+    _, _, _, circuit, _ = christofides_dense(D)
+    tour, _ = improve_tour(D, shortcut(circuit), args.k)
+    print(f"Długość trasy: {tour_length(D, tour)} ({time.perf_counter() - start:.2f} s)")
+    start = time.perf_counter()
+    bound, report = held_karp_bound(D, tour_length(D, tour), args.k, args.iterations)
+    print(f"Ograniczenie Helda-Karpa: {report['bound']} po {report['iterations']} iteracjach "
+          f"({time.perf_counter() - start:.2f} s)")
+    if report["gap"] is not None:
+        print(f"Luka: {100 * report['gap']:.2f}%")
+    tour, stages = improve_tour(D, tour, neighbors=bound.alpha_candidates().tolist())
+    print(f"Długość trasy po poprawie z kandydatami alfa: {stages[-1][1]}")
@@ -0,0 +1,145 @@
+import argparse
+import math
+import time
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components, minimum_spanning_tree
+from scipy.spatial import Delaunay, QhullError, cKDTree
+
+from dense import EXACT_MATCHING, min_weight_perfect_matching, odd_vertices, shortcut
+from localsearch import improve_tour
+
+# Instancje euklidesowe: jedna linia "x y" na miasto. Odległości nie są
+# trzymane w macierzy, tylko liczone na żądanie, a MST, skojarzenie
+# i poprawa trasy działają na rzadkim grafie kandydatów: k najbliższych
+# sąsiadów (drzewo k-d) i krawędzie triangulacji Delaunaya, która zawiera
+# euklidesowe MST. Pamięć to O(n * k) zamiast O(n^2). Numeracja od 0.
+
+
+def load_coordinates(filename):
+    points = np.loadtxt(filename, dtype=np.float64, ndmin=2, comments="#")
+    if points.shape[1] != 2:
+        raise ValueError("Każda linia musi zawierać dwie współrzędne: x y.")
+    return points
+
+
+# Odległości liczone na żądanie; indeksowanie jak w macierzy NumPy:
+# D[i] - wiersz, D[a, b] - pojedyncze lub wektorowe pary (także np.ix_)
+class EuclideanDistances:
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.xs = self.points[:, 0].tolist()
+        self.ys = self.points[:, 1].tolist()
+
+    def __len__(self):
+        return len(self.points)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            a, b = key
+            return np.sqrt(((self.points[a] - self.points[b]) ** 2).sum(axis=-1))
+        return np.sqrt(((self.points - self.points[key]) ** 2).sum(axis=1))
+
+    def item(self, a, b):
+        return math.hypot(self.xs[a] - self.xs[b], self.ys[a] - self.ys[b])
+
+
+# k najbliższych sąsiadów każdego punktu (bez niego samego), rosnąco
+def neighbor_lists(points, k):
+    n = len(points)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.empty((n, 0), dtype=np.int64)
+    _, idx = cKDTree(points).query(points, k + 1)
+    idx = idx.reshape(n, k + 1)
+    # Przy powtórzonych punktach sam punkt nie musi być pierwszy
+    other = idx != np.arange(n)[:, None]
+    order = np.argsort(~other, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(idx, order, axis=1)
+
+
+def candidate_edges(points, k=8, delaunay=True):
+    n = len(points)
+    near = neighbor_lists(points, k)
+    u = np.repeat(np.arange(n), near.shape[1])
+    v = near.ravel()
+    if delaunay and n >= 3:
+        try:
+            simplices = Delaunay(points).simplices
+            u = np.concatenate((u, simplices[:, [0, 1, 2]].ravel()))
+            v = np.concatenate((v, simplices[:, [1, 2, 0]].ravel()))
+        except QhullError:
+            # Punkty współliniowe - wystarczą najbliżsi sąsiedzi
+            pass
+    pairs = np.unique(np.sort(np.column_stack((u, v)), axis=1), axis=0)
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    # Graf kandydatów musi być spójny - w razie potrzeby łańcuch punktów
+    # posortowanych po współrzędnych łączy składowe
+    if n > 1 and _components(n, pairs) > 1:
+        order = np.lexsort((points[:, 1], points[:, 0]))
+        chain = np.sort(np.column_stack((order[:-1], order[1:])), axis=1)
+        pairs = np.unique(np.concatenate((pairs, chain)), axis=0)
+    return pairs
+
+
+def _components(n, pairs):
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    return connected_components(graph, directed=False)[0]
+
+
+def candidate_mst(points, pairs):
+    n = len(points)
+    weights = np.sqrt(((points[pairs[:, 0]] - points[pairs[:, 1]]) ** 2).sum(axis=1))
+    # Zerowe wagi (powtórzone punkty) byłyby dla csgraph brakiem krawędzi
+    weights = np.maximum(weights, np.finfo(np.float64).tiny)
+    graph = coo_matrix((weights, (pairs[:, 0], pairs[:, 1])), shape=(n, n))
+    tree = minimum_spanning_tree(graph).tocoo()
+    return list(zip(tree.row.tolist(), tree.col.tolist()))
+
+
+def christofides_coords(points, k=8, delaunay=True, exact_limit=EXACT_MATCHING):
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    D = EuclideanDistances(points)
+    mst = candidate_mst(points, candidate_edges(points, k, delaunay))
+    odd = odd_vertices(n, mst)
+    candidates = neighbor_lists(points[odd], k) if len(odd) > exact_limit else None
+    matching, exact = min_weight_perfect_matching(D, odd, exact_limit, k, candidates)
+    multigraph = nx.MultiGraph()
+    multigraph.add_nodes_from(range(n))
+    multigraph.add_edges_from(mst)
+    multigraph.add_edges_from(matching)
+    circuit = list(nx.eulerian_circuit(multigraph, source=0)) if n > 1 else []
+    return mst, odd, matching, circuit, exact
+
+
+def coords_tour_length(D, tour):
+    return math.fsum(D.item(a, b) for a, b in zip(tour, tour[1:]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Algorytm Christofidesa dla punktów na płaszczyźnie")
+    parser.add_argument("file", help="plik ze współrzędnymi (x y w każdej linii)")
+    parser.add_argument("-k", type=int, default=8, help="liczba najbliższych sąsiadów w grafie kandydatów")
+    parser.add_argument("--no-delaunay", action="store_true", help="bez krawędzi triangulacji Delaunaya")
+    parser.add_argument("--exact-limit", type=int, default=EXACT_MATCHING,
+                        help="największy zbiór wierzchołków nieparzystych kojarzony dokładnie")
+    parser.add_argument("--no-local-search", action="store_true", help="bez poprawy trasy 2-opt i Or-opt")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    points = load_coordinates(args.file)
+    D = EuclideanDistances(points)
+    mst, odd, matching, circuit, exact = christofides_coords(points, args.k, not args.no_delaunay, args.exact_limit)
+    tour = shortcut(circuit)
+    print(f"Miasta: {len(points)}, wierzchołki nieparzyste: {len(odd)}, "
+          f"skojarzenie {'dokładne' if exact else 'przybliżone'}")
+    print(f"Długość cyklu: {coords_tour_length(D, tour)} ({time.perf_counter() - start:.2f} s)")
+    if not args.no_local_search and len(tour) > 4:
+        neighbors = neighbor_lists(points, args.k).tolist()
+        tour, stages = improve_tour(D, tour, neighbors=neighbors, dist=D.item)
+        for stage, cost in stages:
+            print(f"Koszt trasy ({stage}): {cost}")
+    print(f"Czas: {time.perf_counter() - start:.2f} s")
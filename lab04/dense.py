@@ -0,0 +1,210 @@
+import argparse
+import time
+
+import networkx as nx
+import numpy as np
+
+from distfile import load_matrix
+
+# Kroki algorytmu Christofidesa na gęstej macierzy odległości D (numeracja
+# od 0): algorytm Prima w O(n^2) z wektorowym uaktualnianiem odległości do
+# drzewa oraz minimalne skojarzenie doskonałe wierzchołków nieparzystych.
+# Dla małych zbiorów skojarzenie jest dokładne (algorytm kwiatowy, zostaje
+# gwarancja 1.5), dla dużych zachłanne po k najbliższych sąsiadach,
+# a potem poprawiane zamianami par.
+
+EXACT_MATCHING = 100
+
+
+# penalties - kary wierzchołków (koszt krawędzi i-j to D[i, j] + p[i] + p[j]),
+# skip - wierzchołek pominięty (do budowy 1-drzewa)
+def prim(D, penalties=None, skip=None):
+    n = len(D)
+    parent = np.full(n, -1)
+    if n == 0:
+        return parent
+    in_tree = np.zeros(n, dtype=bool)
+    if skip is not None:
+        in_tree[skip] = True
+    root = 1 if skip == 0 and n > 1 else 0
+    best = _row(D, root, penalties)
+    parent[:] = root
+    in_tree[root] = True
+    best[in_tree] = np.inf
+    for _ in range(n - 1 - (skip is not None)):
+        v = int(np.argmin(best))
+        if not np.isfinite(best[v]):
+            raise ValueError("Graf nie jest spójny.")
+        in_tree[v] = True
+        best[v] = np.inf
+        row = _row(D, v, penalties)
+        closer = (row < best) & ~in_tree
+        best[closer] = row[closer]
+        parent[closer] = v
+    parent[root] = -1
+    if skip is not None:
+        parent[skip] = -1
+    return parent
+
+
+def _row(D, v, penalties):
+    row = np.asarray(D[v], dtype=np.float64)
+    if penalties is None:
+        return row.copy()
+    return row + penalties + penalties[v]
+
+
+def tree_edges(parent):
+    return [(int(parent[v]), v) for v in range(len(parent)) if parent[v] >= 0]
+
+
+def odd_vertices(n, edges):
+    edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+    degree = np.bincount(edges.ravel(), minlength=n)
+    return np.flatnonzero(degree % 2).tolist()
+
+
+def exact_matching(D, vertices):
+    G = nx.Graph()
+    for a, u in enumerate(vertices):
+        for v in vertices[a + 1:]:
+            if np.isfinite(D[u, v]):
+                G.add_edge(u, v, weight=float(D[u, v]))
+    return [tuple(e) for e in nx.algorithms.matching.min_weight_matching(G, weight="weight")]
+
+
+def nearest_candidates(D, vertices, k, block=1024):
+    vertices = np.asarray(vertices)
+    k = min(k, len(vertices) - 1)
+    result = np.empty((len(vertices), k), dtype=np.int64)
+    for start in range(0, len(vertices), block):
+        rows = vertices[start:start + block]
+        sub = D[np.ix_(rows, vertices)].astype(np.float64)
+        sub[np.arange(len(rows)), np.arange(start, start + len(rows))] = np.inf
+        near = np.argpartition(sub, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(sub, near, axis=1), axis=1)
+        result[start:start + len(rows)] = np.take_along_axis(near, order, axis=1)
+    return result
+
+
+def greedy_matching(D, vertices, candidates):
+    vertices = np.asarray(vertices)
+    a = np.repeat(np.arange(len(vertices)), candidates.shape[1])
+    b = candidates.ravel()
+    weights = D[vertices[a], vertices[b]]
+    mate = np.full(len(vertices), -1)
+    for t in np.argsort(weights, kind="stable").tolist():
+        x, y = a[t], b[t]
+        if mate[x] < 0 and mate[y] < 0 and np.isfinite(weights[t]):
+            mate[x] = y
+            mate[y] = x
+    # Pozostałe wierzchołki: skojarzenie zachłanne na wszystkich parach
+    free = np.flatnonzero(mate < 0)
+    if len(free):
+        sub = D[np.ix_(vertices[free], vertices[free])].astype(np.float64)
+        np.fill_diagonal(sub, np.inf)
+        for t in np.argsort(sub, axis=None, kind="stable").tolist():
+            x, y = divmod(t, len(free))
+            if mate[free[x]] < 0 and mate[free[y]] < 0 and x != y:
+                mate[free[x]] = free[y]
+                mate[free[y]] = free[x]
+    return mate
+
+
+# Zamiana par (a, b), (c, d) na (a, c), (b, d) albo (a, d), (b, c),
+# gdy zmniejsza to wagę skojarzenia; c to kandydaci z listy sąsiadów a.
+# Sprawdzane są tylko wierzchołki, których para ostatnio się zmieniła
+def improve_matching(D, vertices, mate, candidates):
+    W = D[np.ix_(vertices, vertices)] if isinstance(D, np.ndarray) and len(vertices) <= 4096 else None
+    index = vertices.tolist()
+
+    def dist(x, y):
+        return W.item(x, y) if W is not None else D.item(index[x], index[y])
+
+    candidates = candidates.tolist()
+    active = list(range(len(vertices)))
+    queued = [True] * len(vertices)
+    swaps = 0
+    while active:
+        a = active.pop()
+        queued[a] = False
+        for c in candidates[a]:
+            b = mate[a]
+            d = mate[c]
+            if c == b or b < 0 or d < 0:
+                continue
+            current = dist(a, b) + dist(c, d)
+            if dist(a, c) + dist(b, d) < current - 1e-12:
+                mate[a], mate[c], mate[b], mate[d] = c, a, d, b
+            elif dist(a, d) + dist(b, c) < current - 1e-12:
+                mate[a], mate[d], mate[b], mate[c] = d, a, c, b
+            else:
+                continue
+            swaps += 1
+            for v in (a, b, c, d):
+                if not queued[v]:
+                    queued[v] = True
+                    active.append(v)
+    return swaps
+
+
+# Zwraca pary wierzchołków i informację, czy skojarzenie jest dokładne
+# (candidates - gotowe listy sąsiadów jako indeksy w vertices)
+def min_weight_perfect_matching(D, vertices, exact_limit=EXACT_MATCHING, k=10, candidates=None):
+    vertices = list(vertices)
+    if len(vertices) < 2:
+        return [], True
+    if len(vertices) <= exact_limit:
+        return exact_matching(D, vertices), True
+    if candidates is None:
+        candidates = nearest_candidates(D, vertices, k)
+    mate = greedy_matching(D, vertices, candidates)
+    improve_matching(D, np.asarray(vertices), mate, candidates)
+    return [(vertices[a], vertices[b]) for a, b in enumerate(mate.tolist()) if a < b], False
+
+
+def shortcut(circuit):
+    seen = set()
+    tour = []
+    for u, _ in circuit:
+        if u not in seen:
+            seen.add(u)
+            tour.append(u)
+    if tour:
+        tour.append(tour[0])
+    return tour
+
+
+def tour_length(D, tour):
+    tour = np.asarray(tour)
+    return float(np.asarray(D[tour[:-1], tour[1:]], dtype=np.float64).sum())
+
+
+def christofides_dense(D, exact_limit=EXACT_MATCHING):
+    n = len(D)
+    mst = tree_edges(prim(D))
+    odd = odd_vertices(n, mst)
+    matching, exact = min_weight_perfect_matching(D, odd, exact_limit)
+    multigraph = nx.MultiGraph()
+    multigraph.add_nodes_from(range(n))
+    multigraph.add_edges_from(mst)
+    multigraph.add_edges_from(matching)
+    circuit = list(nx.eulerian_circuit(multigraph, source=0)) if n > 1 else []
+    return mst, odd, matching, circuit, exact
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Algorytm Christofidesa na macierzy odległości")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("--exact-limit", type=int, default=EXACT_MATCHING,
+                        help="największy zbiór wierzchołków nieparzystych kojarzony dokładnie")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    D = load_matrix(args.file)
+    mst, odd, matching, circuit, exact = christofides_dense(D, args.exact_limit)
+    tour = shortcut(circuit)
+    print(f"Cykl Hamiltona: {[v + 1 for v in tour]}")
+    print(f"Długość cyklu: {tour_length(D, tour)}")
+    print(f"Wierzchołki nieparzyste: {len(odd)}, skojarzenie {'dokładne' if exact else 'przybliżone'}")
+    print(f"Czas: {time.perf_counter() - start:.2f} s")
@@ -0,0 +1,173 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from graphfile import load_edge_file
+
+# Macierz odległości w pliku mapowanym w pamięci: nagłówek (64 bajty),
+# a za nim n * n wartości float32 albo uint16 (gdy wszystkie wagi są
+# całkowite z zakresu 0..65534 i graf jest pełny). Brakująca krawędź to
+# inf (tylko float32). Plik otwierany jest jako np.memmap tylko do odczytu,
+# więc algorytmy z lab04 czytają z niego bezpośrednio, system wczytuje
+# tylko potrzebne strony, a procesy robocze współdzielą te same strony.
+# Plik jest budowany blokami wierszy z listy krawędzi albo ze współrzędnych.
+
+MAGIC = b"DIST"
+VERSION = 1
+HEADER = struct.Struct("<4sIIq")
+HEADER_SIZE = 64
+DTYPES = {0: np.float32, 1: np.uint16}
+CODES = {np.dtype(t): code for code, t in DTYPES.items()}
+UINT16_MISSING = np.iinfo(np.uint16).max
+BLOCK_ELEMENTS = 1 << 24
+
+
+def is_distance_file(filename):
+    with open(filename, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def open_distance_file(filename, mode="r"):
+    with open(filename, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) != HEADER.size:
+        raise ValueError("Plik macierzy odległości jest uszkodzony.")
+    magic, version, code, n = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION or code not in DTYPES:
+        raise ValueError("Nieprawidłowy plik macierzy odległości.")
+    dtype = np.dtype(DTYPES[code])
+    if os.path.getsize(filename) != HEADER_SIZE + n * n * dtype.itemsize:
+        raise ValueError("Plik macierzy odległości jest uszkodzony.")
+    if n == 0:
+        return np.empty((0, 0), dtype=dtype)
+    return np.memmap(filename, dtype=dtype, mode=mode, offset=HEADER_SIZE, shape=(n, n))
+
+
+def _create(filename, n, dtype):
+    header = HEADER.pack(MAGIC, VERSION, CODES[np.dtype(dtype)], n).ljust(HEADER_SIZE, b"\0")
+    with open(filename, "wb") as f:
+        f.write(header)
+        f.truncate(HEADER_SIZE + n * n * np.dtype(dtype).itemsize)
+    return open_distance_file(filename, mode="r+")
+
+
+def _block_rows(n):
+    return max(1, BLOCK_ELEMENTS // max(n, 1))
+
+
+def _fill_edges(D, edges, weights, directed, missing):
+    n = len(D)
+    rows = _block_rows(n)
+    for i0 in range(0, n, rows):
+        block = D[i0:i0 + rows]
+        block[:] = missing
+        i = np.arange(len(block))
+        block[i, i0 + i] = 0
+    chunk = BLOCK_ELEMENTS
+    for start in range(0, len(edges), chunk):
+        part = np.asarray(edges[start:start + chunk], dtype=np.int64) - 1
+        w = np.asarray(weights[start:start + chunk])
+        loops = part[:, 0] == part[:, 1]
+        part, w = part[~loops], w[~loops]
+        D[part[:, 0], part[:, 1]] = w
+        if not directed:
+            D[part[:, 1], part[:, 0]] = w
+
+
+def _has_missing(D, missing):
+    rows = _block_rows(len(D))
+    return any((D[i0:i0 + rows] == missing).any() for i0 in range(0, len(D), rows))
+
+
+# Przepisanie pliku uint16 z brakującymi krawędziami na float32 z inf
+def _to_float32(filename, source):
+    tmp = f"{filename}.f32"
+    target = _create(tmp, len(source), np.float32)
+    rows = _block_rows(len(source))
+    for i0 in range(0, len(source), rows):
+        block = source[i0:i0 + rows].astype(np.float32)
+        block[source[i0:i0 + rows] == UINT16_MISSING] = np.inf
+        target[i0:i0 + rows] = block
+    target.flush()
+    del target
+    return tmp
+
+
+# dtype: "auto" (uint16, jeśli wagi się mieszczą i graf jest pełny),
+# "float32" albo "uint16"
+def build_from_edges(filename, num_vertices, edges, weights, directed=False, dtype="auto"):
+    weights = np.asarray(weights)
+    small = len(weights) == 0 or (weights.min() >= 0 and weights.max() < UINT16_MISSING
+                                  and bool((weights == np.floor(weights)).all()))
+    if dtype == "uint16" and not small:
+        raise ValueError("Wagi muszą być liczbami całkowitymi z zakresu 0..65534.")
+    use_uint16 = dtype == "uint16" or (dtype == "auto" and small)
+    tmp = f"{filename}.tmp"
+    D = _create(tmp, num_vertices, np.uint16 if use_uint16 else np.float32)
+    _fill_edges(D, edges, weights, directed, UINT16_MISSING if use_uint16 else np.inf)
+    D.flush()
+    if use_uint16 and _has_missing(D, UINT16_MISSING):
+        if dtype == "uint16":
+            del D
+            os.remove(tmp)
+            raise ValueError("Graf nie jest pełny - brakujące krawędzie wymagają float32.")
+        converted = _to_float32(tmp, D)
+        del D
+        os.replace(converted, tmp)
+    else:
+        del D
+    os.replace(tmp, filename)
+    return open_distance_file(filename)
+
+
+# Odległości euklidesowe; rounded - zaokrąglenie do liczb całkowitych
+# (jak w TSPLIB), wtedy przy małych wartościach plik jest uint16
+def build_from_coordinates(filename, points, rounded=False):
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    rows = max(1, _block_rows(n) // 8)
+    extent = np.ptp(points, axis=0).sum() if n else 0.0
+    dtype = np.uint16 if rounded and extent < UINT16_MISSING else np.float32
+    tmp = f"{filename}.tmp"
+    D = _create(tmp, n, dtype)
+    for i0 in range(0, n, rows):
+        part = points[i0:i0 + rows]
+        block = np.hypot(part[:, 0, None] - points[:, 0], part[:, 1, None] - points[:, 1])
+        D[i0:i0 + rows] = np.rint(block) if rounded else block
+    D.flush()
+    del D
+    os.replace(tmp, filename)
+    return open_distance_file(filename)
+
+
+# Macierz z pliku binarnego (bez kopiowania) albo z pliku z krawędziami
+def load_matrix(filename):
+    if is_distance_file(filename):
+        return open_distance_file(filename)
+    data = load_edge_file(filename, columns=3)
+    D = np.empty((data.num_vertices, data.num_vertices))
+    _fill_edges(D, data.edges, data.weights, data.kind == "S", np.inf)
+    return D
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Zapis macierzy odległości do pliku mapowanego w pamięci")
+    parser.add_argument("file", help="plik z grafem albo ze współrzędnymi (z opcją --coords)")
+    parser.add_argument("output", help="plik wynikowy")
+    parser.add_argument("--coords", action="store_true", help="plik wejściowy zawiera współrzędne x y")
+    parser.add_argument("--round", action="store_true", help="odległości euklidesowe zaokrąglone do liczb całkowitych")
+    parser.add_argument("--dtype", choices=("auto", "float32", "uint16"), default="auto",
+                        help="typ wartości dla pliku z krawędziami")
+    args = parser.parse_args()
+
+    if args.coords:
+        # Import tylko tutaj - coords korzysta pośrednio z metric, który
+        # importuje ten moduł
+        from coords import load_coordinates
+        D = build_from_coordinates(args.output, load_coordinates(args.file), args.round)
+    else:
+        data = load_edge_file(args.file, columns=3)
+        D = build_from_edges(args.output, data.num_vertices, data.edges, data.weights, data.kind == "S", args.dtype)
+    print(f"Zapisano macierz {len(D)} x {len(D)} ({D.dtype}, {D.nbytes / 2 ** 20:.1f} MB) do {args.output}")
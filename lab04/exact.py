@@ -0,0 +1,214 @@
+import argparse
+import time
+
+import numpy as np
+
+from dense import christofides_dense, prim, shortcut, tour_length
+from distfile import load_matrix
+from localsearch import improve_tour
+
+# Dokładne rozwiązanie problemu komiwojażera dla małych instancji:
+# - programowanie dynamiczne Helda-Karpa po podzbiorach (maski bitowe),
+#   liczone warstwami według liczby elementów podzbioru - w pamięci są
+#   tylko dwie warstwy wartości i wskaźniki poprzedników (1 bajt), a każda
+#   warstwa jest przetwarzana wektorowo w kawałkach ograniczonych
+#   memory_limit,
+# - metoda podziału i ograniczeń z ograniczeniem dolnym z MST
+#   nieodwiedzonych miast, z trasą Christofidesa jako początkowym
+#   rozwiązaniem.
+# Trasy zaczynają się i kończą w mieście 0.
+
+DP_LIMIT = 22
+BNB_LIMIT = 30
+# Przybliżona liczba operacji programowania dynamicznego na sekundę
+DP_SPEED = 5e7
+# Limit czasu podziału i ograniczeń, gdy nie podano własnego [s]; po jego
+# przekroczeniu wynikiem jest najlepsza znaleziona trasa (co najmniej
+# heurystyczna) bez gwarancji optymalności
+BNB_TIME_LIMIT = 10.0
+MST_CACHE = 1 << 20
+
+
+def dp_memory(n):
+    m = n - 1
+    return (1 << m) * (m + 25) + 2 * _layer_size(m) * m * 8
+
+
+def _layer_size(m):
+    return max((_binomial(m, s) for s in range(m + 1)), default=1)
+
+
+def _binomial(n, k):
+    result = 1
+    for i in range(min(k, n - k)):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def held_karp_dp(D, memory_limit=1 << 30):
+    D = np.asarray(D, dtype=np.float64)
+    n = len(D)
+    if n <= 2:
+        tour = list(range(n)) + [0] if n else []
+        return tour, tour_length(D, tour) if n > 1 else 0.0
+    m = n - 1
+    if dp_memory(n) > memory_limit:
+        raise MemoryError("Za mało pamięci na programowanie dynamiczne dla tylu miast.")
+    C = D[1:, 1:]
+    masks = np.arange(1 << m, dtype=np.int64)
+    popcount = np.zeros(1 << m, dtype=np.int8)
+    for j in range(m):
+        popcount += ((masks >> j) & 1).astype(np.int8)
+    order = np.argsort(popcount, kind="stable")
+    bounds = np.searchsorted(popcount[order], np.arange(m + 2))
+    rank = np.empty(1 << m, dtype=np.int64)
+    layers = []
+    for s in range(m + 1):
+        layer = order[bounds[s]:bounds[s + 1]]
+        rank[layer] = np.arange(len(layer))
+        layers.append(layer)
+
+    previous = np.full((m, m), np.inf)
+    previous[np.arange(m), np.arange(m)] = D[0, 1:]
+    parents = [None, np.zeros((m, m), dtype=np.int8)]
+    chunk = max(1, memory_limit // (16 * m * 8))
+    for s in range(2, m + 1):
+        layer = layers[s]
+        current = np.full((len(layer), m), np.inf)
+        parent = np.zeros((len(layer), m), dtype=np.int8)
+        for j in range(m):
+            rows = np.flatnonzero((layer >> j) & 1)
+            for start in range(0, len(rows), chunk):
+                part = rows[start:start + chunk]
+                values = previous[rank[layer[part] ^ (1 << j)]] + C[:, j]
+                best = np.argmin(values, axis=1)
+                current[part, j] = values[np.arange(len(part)), best]
+                parent[part, j] = best
+        previous = current
+        parents.append(parent)
+
+    total = previous[0] + D[1:, 0]
+    j = int(np.argmin(total))
+    cost = float(total[j])
+    mask = (1 << m) - 1
+    path = []
+    for s in range(m, 0, -1):
+        path.append(j + 1)
+        i = int(parents[s][rank[mask], j]) if s > 1 else None
+        mask ^= 1 << j
+        j = i
+    tour = [0] + path[::-1] + [0]
+    return tour, cost
+
+
+def _mst_cost(D, vertices):
+    if len(vertices) < 2:
+        return 0.0
+    sub = D[np.ix_(vertices, vertices)]
+    parent = prim(sub)
+    inner = np.flatnonzero(parent >= 0)
+    return float(sub[inner, parent[inner]].sum())
+
+
+class BranchAndBound:
+    def __init__(self, D, tour, deadline=None):
+        self.D = np.asarray(D, dtype=np.float64)
+        # MST nie zależy od kierunku łuków, więc dla grafu skierowanego
+        # liczone jest na tańszym z kierunków
+        self.S = np.minimum(self.D, self.D.T)
+        self.best_tour = list(tour)
+        self.best = tour_length(self.D, tour)
+        self.deadline = deadline
+        self.nodes = 0
+        self.complete = True
+        # Ten sam zbiór nieodwiedzonych miast pojawia się w wielu gałęziach
+        self.mst_cache = {}
+
+    def lower_bound(self, cost, last, remaining):
+        rest = list(remaining)
+        if not rest:
+            return cost + self.D[last, 0]
+        tree = self.mst_cache.get(remaining)
+        if tree is None:
+            tree = _mst_cost(self.S, rest)
+            if len(self.mst_cache) < MST_CACHE:
+                self.mst_cache[remaining] = tree
+        return cost + tree + self.D[last, rest].min() + self.D[rest, 0].min()
+
+    def solve(self):
+        n = len(self.D)
+        order = np.argsort(self.D, axis=1).tolist()
+        stack = [(0.0, [0], frozenset(range(1, n)))]
+        while stack:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                self.complete = False
+                break
+            cost, path, remaining = stack.pop()
+            self.nodes += 1
+            last = path[-1]
+            if not remaining:
+                total = cost + self.D[last, 0]
+                if total < self.best - 1e-12:
+                    self.best = total
+                    self.best_tour = path + [0]
+                continue
+            if self.lower_bound(cost, last, remaining) >= self.best - 1e-12:
+                continue
+            # Najbliższe miasta na szczycie stosu
+            for v in reversed(order[last]):
+                if v in remaining:
+                    new_cost = cost + self.D[last, v]
+                    if new_cost < self.best:
+                        stack.append((new_cost, path + [v], remaining - {v}))
+        return self.best_tour, self.best
+
+
+# Porównanie blokami wierszy - bez tymczasowej macierzy n x n
+def _symmetric(D, rows=1024):
+    return all(np.array_equal(D[i:i + rows], D[:, i:i + rows].T) for i in range(0, len(D), rows))
+
+
+def heuristic_tour(D):
+    _, _, _, circuit, _ = christofides_dense(D)
+    tour = shortcut(circuit)
+    # 2-opt odwraca fragmenty trasy, więc działa tylko dla macierzy
+    # symetrycznej (dla niesymetrycznej mógłby się zapętlić)
+    if _symmetric(D):
+        tour, _ = improve_tour(D, tour)
+    return tour
+
+
+# Wybór metody: programowanie dynamiczne, gdy zmieści się w pamięci
+# i czasie, podział i ograniczenia dla nieco większych instancji,
+# a dla dużych heurystyka
+def solve_tsp(D, time_limit=None, memory_limit=1 << 30):
+    n = len(D)
+    start = time.perf_counter()
+    m = max(n - 1, 1)
+    dp_seconds = m * m * (1 << m) / DP_SPEED
+    if n <= DP_LIMIT and dp_memory(n) <= memory_limit and (time_limit is None or dp_seconds <= time_limit):
+        tour, cost = held_karp_dp(D, memory_limit)
+        return tour, cost, {"method": "dp", "optimal": True, "seconds": time.perf_counter() - start}
+    tour = heuristic_tour(D)
+    if n <= BNB_LIMIT:
+        deadline = start + (time_limit if time_limit is not None else BNB_TIME_LIMIT)
+        bnb = BranchAndBound(D, tour, deadline)
+        tour, cost = bnb.solve()
+        return tour, cost, {"method": "bnb", "optimal": bnb.complete, "nodes": bnb.nodes,
+                            "seconds": time.perf_counter() - start}
+    return tour, tour_length(D, tour), {"method": "heuristic", "optimal": False,
+                                        "seconds": time.perf_counter() - start}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dokładne rozwiązanie problemu komiwojażera")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("--time-limit", type=float, help="limit czasu [s]")
+    args = parser.parse_args()
+
+    D = load_matrix(args.file)
+    tour, cost, report = solve_tsp(D, args.time_limit)
+    names = {"dp": "programowanie dynamiczne", "bnb": "podział i ograniczenia", "heuristic": "heurystyka"}
+    print(f"Metoda: {names[report['method']]} ({report['seconds']:.2f} s)")
+    print(f"Trasa: {[v + 1 for v in tour]}")
+    print(f"Długość: {cost}" + ("" if report["optimal"] else " (rozwiązanie może nie być optymalne)"))
@@ -0,0 +1,179 @@
+import numpy as np
+
+from dense import nearest_candidates
+
+# Poprawa trasy po skróceniu cyklu Eulera: ruchy 2-opt oraz Or-opt
+# (przeniesienie odcinka 1-3 miast w inne miejsce, w tej samej lub
+# odwróconej kolejności). Ruchy są szukane tylko wśród k najbliższych
+# sąsiadów, a bity "nie patrz" pomijają miasta, wokół których ostatnio nic
+# się nie zmieniło. Trasa to tablica miast z indeksem pozycji, więc
+# następnik, poprzednik i zysk ruchu liczone są w O(1).
+
+EPS = 1e-10
+
+
+class LocalSearch:
+    def __init__(self, dist, neighbors, tour):
+        self.dist = dist
+        self.neighbors = neighbors
+        self.tour = list(tour)
+        self.n = len(self.tour)
+        self.pos = [0] * self.n
+        for i, v in enumerate(self.tour):
+            self.pos[v] = i
+        self.moves = 0
+
+    def next(self, v):
+        return self.tour[(self.pos[v] + 1) % self.n]
+
+    def prev(self, v):
+        return self.tour[self.pos[v] - 1]
+
+    def cost(self):
+        return sum(self.dist(self.tour[i - 1], self.tour[i]) for i in range(self.n))
+
+    # Odwrócenie fragmentu trasy od a do b (w kierunku następników);
+    # odwracana jest krótsza z dwóch części cyklu
+    def reverse(self, a, b):
+        i, j = self.pos[a], self.pos[b]
+        length = (j - i) % self.n + 1
+        if 2 * length > self.n:
+            i, j = (j + 1) % self.n, (i - 1) % self.n
+            length = self.n - length
+        tour, pos, n = self.tour, self.pos, self.n
+        for _ in range(length // 2):
+            x, y = tour[i], tour[j]
+            tour[i], tour[j] = y, x
+            pos[y], pos[x] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def _activate(self, active, queued, *vertices):
+        for v in vertices:
+            if not queued[v]:
+                queued[v] = True
+                active.append(v)
+
+    def _two_opt_vertex(self, a):
+        d = self.dist
+        for forward in (True, False):
+            b = self.next(a) if forward else self.prev(a)
+            ab = d(a, b)
+            for c in self.neighbors[a]:
+                ac = d(a, c)
+                if ac >= ab:
+                    break
+                e = self.next(c) if forward else self.prev(c)
+                if c == b or e == a:
+                    continue
+                delta = ac + d(b, e) - ab - d(c, e)
+                if delta < -EPS:
+                    if forward:
+                        self.reverse(b, c)
+                    else:
+                        self.reverse(c, b)
+                    self.moves += 1
+                    return a, b, c, e
+        return None
+
+    def two_opt(self):
+        return self._run(self._two_opt_vertex)
+
+    def _or_opt_vertex(self, a):
+        d = self.dist
+        n = self.n
+        i = self.pos[a]
+        for length in (1, 2, 3):
+            if i + length > n or length > n - 3:
+                break
+            s1, s2 = a, self.tour[i + length - 1]
+            p = self.prev(s1)
+            q = self.next(s2)
+            gain = d(p, s1) + d(s2, q) - d(p, q)
+            if gain <= EPS:
+                continue
+            segment = set(self.tour[i:i + length])
+            for end in (s1, s2):
+                for c in self.neighbors[end]:
+                    if d(end, c) >= gain:
+                        break
+                    if c in segment:
+                        continue
+                    for e in (self.next(c), self.prev(c)):
+                        if e in segment:
+                            continue
+                        # Odcinek wstawiany między c i e: end sąsiaduje z c
+                        other = s2 if end == s1 else s1
+                        delta = d(c, end) + d(other, e) - d(c, e) - gain
+                        if delta < -EPS:
+                            after = c if e == self.next(c) else e
+                            # Przy wstawianiu za "after" odcinek zaczyna się
+                            # od końca sąsiadującego z "after"
+                            first = end if after == c else other
+                            self._move_segment(i, length, after, reverse=first != s1)
+                            self.moves += 1
+                            return p, q, c, e, s1, s2
+        return None
+
+    def _move_segment(self, i, length, after, reverse):
+        tour, pos = self.tour, self.pos
+        segment = tour[i:i + length]
+        if reverse:
+            segment.reverse()
+        j = pos[after]
+        if j > i:
+            tour[i:j + 1] = tour[i + length:j + 1] + segment
+            start, end = i, j + 1
+        else:
+            tour[j + 1:i + length] = segment + tour[j + 1:i]
+            start, end = j + 1, i + length
+        for k in range(start, end):
+            pos[tour[k]] = k
+
+    def or_opt(self):
+        return self._run(self._or_opt_vertex)
+
+    def _run(self, step):
+        active = list(self.tour)
+        queued = [True] * self.n
+        moves = self.moves
+        while active:
+            a = active.pop()
+            queued[a] = False
+            changed = step(a)
+            if changed is not None:
+                self._activate(active, queued, a, *changed)
+        return self.moves - moves
+
+    def closed_tour(self):
+        if not self.tour:
+            return []
+        i = self.pos[self.tour[0]]
+        return self.tour[i:] + self.tour[:i] + [self.tour[i]]
+
+
+# tour - cykl Hamiltona (pierwsze miasto powtórzone na końcu); zwraca
+# poprawioną trasę i listę (etap, koszt) po każdym etapie
+def improve_tour(D, tour, k=10, rounds=5, neighbors=None, dist=None):
+    if dist is None:
+        # item zwraca liczbę Pythona - bez kopiowania macierzy (także
+        # zmapowanej z pliku) i bez przepełnień dla uint16
+        D = np.asarray(D)
+        dist = D.item
+    if neighbors is None:
+        neighbors = nearest_candidates(D, range(len(D)), k).tolist()
+    start = tour[0]
+    search = LocalSearch(dist, neighbors, tour[:-1])
+    report = [("start", search.cost())]
+    if search.n < 4:
+        return list(tour), report
+    for _ in range(rounds):
+        moves = search.two_opt()
+        report.append(("2-opt", search.cost()))
+        moves += search.or_opt()
+        report.append(("Or-opt", search.cost()))
+        if moves == 0:
+            break
+    result = search.tour
+    i = search.pos[start]
+    return result[i:] + result[:i] + [start], report
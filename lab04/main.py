@@ -1,5 +1,11 @@
 import networkx as nx
 import matplotlib.pyplot as plt
+from graphfile import load_edge_file
+from metric import distance_matrix, triangle_violation, sampled_triangle_violation
+from dense import prim, tree_edges, odd_vertices, min_weight_perfect_matching, tour_length
+from localsearch import improve_tour
+from bound import held_karp_bound
+from exact import DP_LIMIT, solve_tsp
 
 
 class Graph:
@@ -12,60 +18,65 @@ class Graph:
 
     def load_from_file(self, filename):
         try:
-            with open(filename, 'r') as f:
-                lines = f.readlines()
-                graph_type = lines[0].strip()
-                self.directed = True if graph_type == 'S' else False
-                self.graph = nx.DiGraph() if self.directed else nx.Graph()
-
-                self.num_vertices = int(lines[1].strip())
-                for line in lines[2:]:
-                    u, v, weight = map(int, line.split())
-                    self.add_edge(u, v, weight)
+            data = load_edge_file(filename, columns=3)
+            self.directed = True if data.kind == 'S' else False
+            self.graph = nx.DiGraph() if self.directed else nx.Graph()
+
+            self.num_vertices = data.num_vertices
+            self.graph.add_weighted_edges_from(
+                zip(data.edges[:, 0].tolist(), data.edges[:, 1].tolist(), data.weights.tolist())
+            )
         except FileNotFoundError:
             print("Plik nie został znaleziony.")
         except ValueError as ve:
             print(f"Błąd w danych: {ve}")
 
 
-# Sprawdzanie nierówności trójkąta
-def verify_triangle_inequality(graph):
-    for u in graph.nodes():
-        for v in graph.nodes():
-            if u != v:
-                for w in graph.nodes():
-                    if u != w and v != w:
-                        if graph.has_edge(u, v) and graph.has_edge(v, w) and graph.has_edge(w, u):
-                            uv_weight = graph[u][v]['weight']
-                            vw_weight = graph[v][w]['weight']
-                            wu_weight = graph[w][u]['weight']
-                            if uv_weight + vw_weight <= wu_weight or uv_weight + wu_weight <= vw_weight or vw_weight + wu_weight <= uv_weight:
-                                return False
-    return True
+# Sprawdzanie nierówności trójkąta - pierwsza trójka wierzchołków (u, v, w),
+# dla której d(u, w) > d(u, v) + d(v, w), albo None; z samples sprawdzane
+# są tylko losowe trójki
+def find_triangle_violation(nodes, D, samples=None):
+    if samples:
+        violation = sampled_triangle_violation(D, samples)
+    else:
+        violation = triangle_violation(D)
+    if violation is None:
+        return None
+    return tuple(nodes[i] for i in violation)
 
 
 # Algorytm Christofidesa
-def christofides(graph):
+def christofides(graph, samples=None):
     print("Krok 1: Sprawdzenie nierówności trójkąta")
-    if not verify_triangle_inequality(graph):
-        print("Graf nie spełnia nierówności trójkąta!")
+    nodes, D = distance_matrix(graph)
+    violation = find_triangle_violation(nodes, D, samples)
+    if violation is not None:
+        u, v, w = violation
+        print(f"Graf nie spełnia nierówności trójkąta: d({u}, {w}) = {graph[u][w]['weight']} > "
+              f"d({u}, {v}) + d({v}, {w}) = {graph[u][v]['weight'] + graph[v][w]['weight']}")
         return None
     print("Nierówność trójkąta spełniona")
 
     print("Krok 2: Obliczanie minimalnego drzewa rozpinającego (MST)")
-    mst = nx.minimum_spanning_tree(graph)
+    mst_edges = tree_edges(prim(D))
+    mst = nx.Graph()
+    mst.add_nodes_from(nodes)
+    mst.add_weighted_edges_from((nodes[u], nodes[v], D[u, v]) for u, v in mst_edges)
 
     print("Krok 3: Znalezienie wierzchołków o nieparzystym stopniu w MST")
-    odd_degree_nodes = [v for v, deg in mst.degree() if deg % 2 != 0]
+    odd = odd_vertices(len(nodes), mst_edges)
+    odd_degree_nodes = [nodes[v] for v in odd]
 
     print("Krok 4: Minimalne skojarzenie dla wierzchołków o nieparzystym stopniu")
-    subgraph = graph.subgraph(odd_degree_nodes)
-    matching = nx.max_weight_matching(subgraph, maxcardinality=True, weight='weight')
+    pairs, exact = min_weight_perfect_matching(D, odd)
+    if not exact:
+        print("Skojarzenie przybliżone (zachłanne z poprawą) - bez gwarancji 1.5")
+    matching = {(nodes[u], nodes[v]) for u, v in pairs}
 
     print("Krok 5: Połączenie MST i skojarzeń")
     eulerian_graph = nx.MultiGraph(mst)
-    for u, v in matching:
-        eulerian_graph.add_edge(u, v, weight=subgraph[u][v]['weight'])
+    for u, v in pairs:
+        eulerian_graph.add_edge(nodes[u], nodes[v], weight=D[u, v])
 
     print("Krok 6: Sprawdzanie, czy graf jest Eulera")
     if not nx.is_connected(eulerian_graph) or any(deg % 2 != 0 for v, deg in eulerian_graph.degree()):
@@ -109,4 +120,21 @@ hamilton.append(hamilton[0])
 
 print(f"Cykl Hamiltona: {hamilton}")
 
+# Poprawa trasy ruchami 2-opt i Or-opt
+nodes, D = distance_matrix(graph.graph)
+index = {v: i for i, v in enumerate(nodes)}
+improved, stages = improve_tour(D, [index[v] for v in hamilton])
+for stage, cost in stages:
+    print(f"Koszt trasy ({stage}): {cost}")
+hamilton = [nodes[i] for i in improved]
+print(f"Cykl Hamiltona po poprawie: {hamilton} (długość {tour_length(D, improved)})")
+
+_, report = held_karp_bound(D, tour_length(D, improved))
+print(f"Dolne ograniczenie Helda-Karpa: {report['bound']} (luka: {100 * report['gap']:.2f}%)")
+
+# Dla małych grafów optimum wyznaczone dokładnie
+if len(nodes) <= DP_LIMIT:
+    optimal, optimal_cost, _ = solve_tsp(D)
+    print(f"Optymalny cykl Hamiltona: {[nodes[i] for i in optimal]} (długość {optimal_cost})")
+
 draw_graph(graph.graph, mst=mst, matching=matching, odd_degree_nodes=odd_degree_nodes)
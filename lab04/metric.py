@@ -0,0 +1,108 @@
+import argparse
+
+import numpy as np
+
+from distfile import load_matrix
+
+# Sprawdzanie nierówności trójkąta na gęstej macierzy odległości:
+# d[i, k] <= d[i, j] + d[j, k] dla każdej trójki. Brakujące krawędzie to
+# inf i trójki z brakującą krawędzią nie są sprawdzane. Obliczenia idą
+# blokami (wiersze i x wierzchołki pośrednie j), żeby tablica pomocnicza
+# miała najwyżej max_elements elementów, i kończą się na pierwszym
+# naruszeniu. Tryb losowy sprawdza tylko wylosowane trójki. Dla macierzy
+# zmiennoprzecinkowych (np. float32 z pliku) tolerancja rośnie z wartościami
+# odległości, żeby błąd zaokrąglenia nie był brany za naruszenie.
+
+
+def distance_matrix(graph, nodes=None):
+    nodes = list(graph.nodes()) if nodes is None else list(nodes)
+    index = {v: i for i, v in enumerate(nodes)}
+    D = np.full((len(nodes), len(nodes)), np.inf)
+    for u, v, w in graph.edges(data="weight", default=1):
+        D[index[u], index[v]] = w
+        if not graph.is_directed():
+            D[index[v], index[u]] = w
+    np.fill_diagonal(D, 0)
+    return nodes, D
+
+
+def edges_to_matrix(num_vertices, edges, weights, directed=False):
+    D = np.full((num_vertices, num_vertices), np.inf)
+    edges = np.asarray(edges) - 1
+    D[edges[:, 0], edges[:, 1]] = weights
+    if not directed:
+        D[edges[:, 1], edges[:, 0]] = weights
+    np.fill_diagonal(D, 0)
+    return D
+
+
+# Względny błąd zaokrąglenia sumy d[i, j] + d[j, k] i wartości d[i, k]
+def _relative_tol(D):
+    dtype = np.dtype(getattr(D, "dtype", np.float64))
+    return 4 * float(np.finfo(dtype).eps) if np.issubdtype(dtype, np.floating) else 0.0
+
+
+# Pierwsza trójka (i, j, k) z d[i, k] > d[i, j] + d[j, k] albo None
+def triangle_violation(D, tol=1e-9, max_elements=1 << 22):
+    n = len(D)
+    if n < 3:
+        return None
+    scale = 1 + _relative_tol(D)
+    rows = max(1, min(n, int(np.sqrt(max_elements / n))))
+    through = np.empty((rows, rows, n))
+    bad = np.empty((rows, rows, n), dtype=bool)
+    for i0 in range(0, n, rows):
+        left = np.asarray(D[i0:i0 + rows], dtype=np.float64)
+        b = len(left)
+        # Brakująca krawędź i-k nie może naruszyć nierówności
+        target = np.where(np.isfinite(left), left - tol, -np.inf)
+        for j0 in range(0, n, rows):
+            c = min(rows, n - j0)
+            t = through[:b, :c]
+            np.add(left[:, j0:j0 + c, None], np.asarray(D[j0:j0 + c], dtype=np.float64)[None], out=t)
+            if scale != 1:
+                np.multiply(t, scale, out=t)
+            v = bad[:b, :c]
+            np.greater(target[:, None, :], t, out=v)
+            if v.any():
+                i, j, k = np.argwhere(v)[0]
+                return int(i0 + i), int(j0 + j), int(k)
+    return None
+
+
+def sampled_triangle_violation(D, samples=1_000_000, seed=None, tol=1e-9, batch=1 << 18):
+    n = len(D)
+    if n < 3:
+        return None
+    relative = _relative_tol(D)
+    rng = np.random.default_rng(seed)
+    for start in range(0, samples, batch):
+        size = min(batch, samples - start)
+        i, j, k = rng.integers(0, n, (3, size))
+        ik = np.asarray(D[i, k], dtype=np.float64)
+        through = np.asarray(D[i, j], dtype=np.float64) + D[j, k]
+        bad = (ik > through + tol + relative * np.abs(through)) & np.isfinite(ik)
+        if bad.any():
+            t = np.flatnonzero(bad)[0]
+            return int(i[t]), int(j[t]), int(k[t])
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sprawdzanie nierówności trójkąta")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("--samples", type=int, help="sprawdź tylko tyle losowych trójek")
+    parser.add_argument("--seed", type=int, help="ziarno losowania trójek")
+    args = parser.parse_args()
+
+    D = load_matrix(args.file)
+    if args.samples:
+        violation = sampled_triangle_violation(D, args.samples, args.seed)
+    else:
+        violation = triangle_violation(D)
+    if violation is None:
+        print("Nierówność trójkąta spełniona" + (" (dla wylosowanych trójek)" if args.samples else ""))
+    else:
+        i, j, k = violation
+        print(f"Nierówność trójkąta nie jest spełniona: d({i + 1}, {k + 1}) = {D[i, k]} > "
+              f"d({i + 1}, {j + 1}) + d({j + 1}, {k + 1}) = {D[i, j] + D[j, k]}")
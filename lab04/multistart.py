@@ -0,0 +1,141 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from dense import (EXACT_MATCHING, min_weight_perfect_matching, nearest_candidates, odd_vertices, prim,
+                   tour_length, tree_edges)
+from distfile import load_matrix, open_distance_file
+from localsearch import improve_tour
+
+# Wielokrotny Christofides: MST i skojarzenie liczone są raz, a potem
+# w puli procesów powstaje wiele losowych cykli Eulera (losowy wierzchołek
+# startowy i losowa kolejność krawędzi w algorytmie Hierholzera), które są
+# skracane do cykli Hamiltona i opcjonalnie poprawiane 2-opt i Or-opt.
+# Macierz odległości trafia raz do pamięci współdzielonej (a macierz
+# zmapowana z pliku jest mapowana przez każdy proces z tego samego pliku),
+# zadania przesyłają tylko ziarno, a wraca koszt i trasa. Listy kandydatów
+# do poprawy trasy liczone są raz w procesie głównym i przekazywane
+# procesom przy starcie jako tablica int32.
+
+
+def random_euler_circuit(n, edges, rng):
+    adj = [[] for _ in range(n)]
+    for e, (u, v) in enumerate(edges):
+        adj[u].append((v, e))
+        adj[v].append((u, e))
+    for neighbors in adj:
+        rng.shuffle(neighbors)
+    used = bytearray(len(edges))
+    pointer = [0] * n
+    stack = [rng.randrange(n)]
+    circuit = []
+    while stack:
+        v = stack[-1]
+        neighbors = adj[v]
+        i = pointer[v]
+        while i < len(neighbors) and used[neighbors[i][1]]:
+            i += 1
+        pointer[v] = i
+        if i < len(neighbors):
+            u, e = neighbors[i]
+            used[e] = 1
+            stack.append(u)
+        else:
+            circuit.append(stack.pop())
+    return circuit
+
+
+def shortcut_circuit(circuit):
+    tour = list(dict.fromkeys(circuit))
+    return tour + tour[:1]
+
+
+def run_trial(D, edges, neighbors, seed, local_search=True):
+    rng = random.Random(seed)
+    tour = shortcut_circuit(random_euler_circuit(len(D), edges, rng))
+    if local_search and len(tour) > 4:
+        tour, _ = improve_tour(D, tour, neighbors=neighbors)
+    return tour_length(D, tour), tour
+
+
+_worker = {}
+
+
+def _init_worker(name, shape, edges, neighbors):
+    if shape is None:
+        D = open_distance_file(name)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+        D = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        # Pamięć musi pozostać otwarta, dopóki proces korzysta z macierzy
+        _worker["shm"] = shm
+    _worker["D"] = D
+    _worker["edges"] = edges
+    _worker["local_search"] = neighbors is not None
+    _worker["neighbors"] = neighbors.tolist() if neighbors is not None else None
+
+
+def _trial(seed):
+    cost, tour = run_trial(_worker["D"], _worker["edges"], _worker["neighbors"], seed, _worker["local_search"])
+    return cost, seed, tour
+
+
+def christofides_multigraph(D, exact_limit=EXACT_MATCHING):
+    mst = tree_edges(prim(D))
+    odd = odd_vertices(len(D), mst)
+    matching, exact = min_weight_perfect_matching(D, odd, exact_limit)
+    return mst + [tuple(map(int, e)) for e in matching], exact
+
+
+def multistart_christofides(D, trials=16, processes=None, first_seed=0, local_search=True, k=10,
+                            exact_limit=EXACT_MATCHING):
+    if len(D) < 3:
+        tour = list(range(len(D))) + [0] if len(D) else []
+        return tour, tour_length(D, tour) if len(D) > 1 else 0.0, None, []
+    edges, _ = christofides_multigraph(D, exact_limit)
+    neighbors = nearest_candidates(D, range(len(D)), k).astype(np.int32) if local_search else None
+    seeds = range(first_seed, first_seed + trials)
+    if isinstance(D, np.memmap) and D.filename:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(D.filename, None, edges, neighbors)) as pool:
+            results = list(pool.map(_trial, seeds))
+    else:
+        D = np.ascontiguousarray(D, dtype=np.float64)
+        shm = shared_memory.SharedMemory(create=True, size=D.nbytes)
+        try:
+            np.ndarray(D.shape, dtype=np.float64, buffer=shm.buf)[:] = D
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=(shm.name, D.shape, edges, neighbors)) as pool:
+                results = list(pool.map(_trial, seeds))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    best_cost, best_seed, best_tour = min(results, key=lambda r: (r[0], r[1]))
+    # Trasa od miasta 0, jak w pozostałych wariantach
+    i = best_tour.index(0)
+    best_tour = best_tour[i:-1] + best_tour[:i] + [0]
+    return best_tour, best_cost, best_seed, [cost for cost, _, _ in results]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Najlepsza z wielu losowych tras Christofidesa")
+    parser.add_argument("file", nargs="?", default="file.txt", help="plik z grafem")
+    parser.add_argument("--trials", type=int, default=16, help="liczba losowych cykli Eulera")
+    parser.add_argument("--processes", type=int, help="liczba procesów")
+    parser.add_argument("--first-seed", type=int, default=0, help="ziarno pierwszego uruchomienia")
+    parser.add_argument("-k", type=int, default=10, help="liczba kandydatów na wierzchołek w poprawie trasy")
+    parser.add_argument("--no-local-search", action="store_true", help="bez poprawy trasy 2-opt i Or-opt")
+    args = parser.parse_args()
+
+    D = load_matrix(args.file)
+    start = time.perf_counter()
+    tour, cost, seed, costs = multistart_christofides(D, args.trials, args.processes, args.first_seed,
+                                                      not args.no_local_search, args.k)
+    print(f"Długości tras w kolejnych uruchomieniach: {costs}")
+    print(f"Najkrótsza trasa (ziarno {seed}): {[v + 1 for v in tour]}")
+    print(f"Długość: {cost} ({time.perf_counter() - start:.2f} s)")
@@ -0,0 +1,25 @@
+import numpy as np
+
+from distfile import build_from_coordinates, build_from_edges
+from metric import sampled_triangle_violation, triangle_violation
+
+
+def test_float32_coordinates_pass_metric_check(tmp_path):
+    points = np.random.default_rng(0).random((300, 2)) * 1000
+    D = build_from_coordinates(tmp_path / "points.dist", points)
+    assert D.dtype == np.float32
+    assert triangle_violation(D) is None
+    assert sampled_triangle_violation(D, 200_000, seed=1) is None
+
+
+def test_violation_still_found_in_float32(tmp_path):
+    edges = np.array([[1, 2], [2, 3], [1, 3]])
+    D = build_from_edges(tmp_path / "bad.dist", 3, edges, [1.5, 1.5, 10.25], dtype="float32")
+    assert triangle_violation(D) is not None
+
+
+def test_fractional_weights_stay_float32(tmp_path):
+    edges = np.array([[1, 2], [2, 3], [1, 3]])
+    D = build_from_edges(tmp_path / "frac.dist", 3, edges, [1.5, 1.5, 2.25])
+    assert D.dtype == np.float32
+    assert D[0, 2] == 2.25
@@ -0,0 +1,76 @@
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from dense import tour_length
+from exact import BranchAndBound, held_karp_dp, heuristic_tour, solve_tsp
+
+
+def _random_matrix(rng, n, symmetric=True):
+    D = rng.integers(1, 100, (n, n)).astype(np.float64)
+    if symmetric:
+        D = np.minimum(D, D.T)
+    np.fill_diagonal(D, 0)
+    return D
+
+
+def _brute_force(D):
+    n = len(D)
+    if n <= 1:
+        return 0.0
+    return min(tour_length(D, [0, *p, 0]) for p in itertools.permutations(range(1, n)))
+
+
+def _check_tour(D, tour, cost):
+    n = len(D)
+    assert tour[0] == tour[-1] == 0
+    assert sorted(tour[:-1]) == list(range(n))
+    assert tour_length(D, tour) == pytest.approx(cost)
+
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_dp_is_optimal(symmetric):
+    rng = np.random.default_rng(0)
+    for n in range(2, 9):
+        D = _random_matrix(rng, n, symmetric)
+        tour, cost = held_karp_dp(D)
+        _check_tour(D, tour, cost)
+        assert cost == pytest.approx(_brute_force(D))
+
+
+@pytest.mark.parametrize("symmetric", [True, False])
+def test_branch_and_bound_is_optimal(symmetric):
+    rng = np.random.default_rng(1)
+    for n in range(3, 9):
+        D = _random_matrix(rng, n, symmetric)
+        bnb = BranchAndBound(D, heuristic_tour(D))
+        tour, cost = bnb.solve()
+        assert bnb.complete
+        _check_tour(D, tour, cost)
+        assert cost == pytest.approx(_brute_force(D))
+
+
+def test_branch_and_bound_stops_at_deadline():
+    D = _random_matrix(np.random.default_rng(2), 12)
+    bnb = BranchAndBound(D, heuristic_tour(D), deadline=time.perf_counter() - 1)
+    tour, cost = bnb.solve()
+    assert not bnb.complete
+    _check_tour(D, tour, cost)
+
+
+def test_solve_tsp_small_instances():
+    rng = np.random.default_rng(3)
+    for n in range(1, 8):
+        D = _random_matrix(rng, n)
+        tour, cost, info = solve_tsp(D)
+        assert info["method"] == "dp" and info["optimal"]
+        assert cost == pytest.approx(_brute_force(D))
+
+
+def test_solve_tsp_asymmetric_beyond_dp():
+    D = _random_matrix(np.random.default_rng(4), 25, symmetric=False)
+    tour, cost, info = solve_tsp(D, time_limit=1.0)
+    assert info["method"] == "bnb"
+    _check_tour(D, tour, cost)
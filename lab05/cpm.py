@@ -0,0 +1,188 @@
+import argparse
+import time
+from collections import namedtuple
+from string import ascii_uppercase
+
+import numpy as np
+
+# Rdzeń metody ścieżki krytycznej (CPM) na tablicach: zdarzenia to liczby
+# 0..n-1, czynność k to łuk u[k] -> v[k] o czasie trwania d[k]. Czynności
+# wychodzące i wchodzące do zdarzeń są w postaci CSR (wskaźniki początków
+# i numery czynności posortowane po zdarzeniu), porządek topologiczny
+# wyznacza algorytm Kahna, a przejścia w przód i w tył liczą najwcześniejsze
+# i najpóźniejsze terminy zdarzeń w O(V + E). Terminy czynności (ES, EF, LS,
+# LF) oraz zapasy całkowite i swobodne liczone są wektorowo. Nazwy literowe
+# zdarzeń (A..Z, AA, AB, ...) służą tylko do prezentacji.
+
+Schedule = namedtuple("Schedule", ["order", "early", "late", "es", "ef", "ls", "lf",
+                                   "total_float", "free_float", "makespan"])
+
+
+# tasks - trójki (początek, koniec, czas trwania) z dowolnymi nazwami
+# zdarzeń; zdarzenia numerowane są w kolejności pierwszego wystąpienia
+def index_events(tasks):
+    index = {}
+    u = []
+    v = []
+    d = []
+    for start, end, duration in tasks:
+        u.append(index.setdefault(start, len(index)))
+        v.append(index.setdefault(end, len(index)))
+        d.append(duration)
+    return list(index), np.array(u, dtype=np.int64), np.array(v, dtype=np.int64), np.array(d)
+
+
+# Czynności zdarzenia x to activities[indptr[x]:indptr[x + 1]]
+# (w kolejności wejściowej); ends - początki (następniki) albo końce
+# (poprzedniki) czynności
+def csr(n, ends):
+    activities = np.argsort(ends, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n), out=indptr[1:])
+    return indptr, activities
+
+
+def topological_order(n, u, v, successors=None):
+    indptr, activities = successors if successors is not None else csr(n, u)
+    in_degree = np.bincount(v, minlength=n).tolist()
+    indptr = indptr.tolist()
+    heads = v[activities].tolist()
+    order = [x for x in range(n) if in_degree[x] == 0]
+    i = 0
+    while i < len(order):
+        x = order[i]
+        i += 1
+        for k in range(indptr[x], indptr[x + 1]):
+            y = heads[k]
+            in_degree[y] -= 1
+            if in_degree[y] == 0:
+                order.append(y)
+    if len(order) < n:
+        raise ValueError("Graf zawiera cykl - nie istnieje porządek topologiczny.")
+    return np.array(order, dtype=np.int64)
+
+
+def _forward(order, predecessors, u, d, dtype):
+    indptr, activities = predecessors
+    indptr = indptr.tolist()
+    tails = u[activities].tolist()
+    lengths = d[activities].tolist()
+    early = [0] * len(order)
+    for x in order:
+        best = 0
+        for k in range(indptr[x], indptr[x + 1]):
+            t = early[tails[k]] + lengths[k]
+            if t > best:
+                best = t
+        early[x] = best
+    return np.array(early, dtype=dtype)
+
+
+def _backward(order, successors, v, d, makespan, dtype):
+    indptr, activities = successors
+    indptr = indptr.tolist()
+    heads = v[activities].tolist()
+    lengths = d[activities].tolist()
+    late = [makespan] * len(order)
+    for x in reversed(order):
+        best = makespan
+        for k in range(indptr[x], indptr[x + 1]):
+            t = late[heads[k]] - lengths[k]
+            if t < best:
+                best = t
+        late[x] = best
+    return np.array(late, dtype=dtype)
+
+
+def schedule(n, u, v, d, successors=None, predecessors=None):
+    u = np.asarray(u, dtype=np.int64)
+    v = np.asarray(v, dtype=np.int64)
+    d = np.asarray(d)
+    dtype = np.result_type(d.dtype, np.int64)
+    if successors is None:
+        successors = csr(n, u)
+    if predecessors is None:
+        predecessors = csr(n, v)
+    order = topological_order(n, u, v, successors)
+    order_list = order.tolist()
+    early = _forward(order_list, predecessors, u, d, dtype)
+    makespan = early.max() if n else dtype.type(0)
+    late = _backward(order_list, successors, v, d, makespan.item(), dtype)
+    es = early[u]
+    ef = es + d
+    lf = late[v]
+    ls = lf - d
+    return Schedule(order, early, late, es, ef, ls, lf, ls - es, early[v] - ef, makespan)
+
+
+# Czynności ścieżki krytycznej od zdarzenia początkowego do końca projektu
+# (przy kilku ścieżkach - pierwsza czynność krytyczna z każdego zdarzenia)
+def critical_path(result, v, successors, tol=1e-9):
+    indptr, activities = successors
+    indptr = indptr.tolist()
+    activities = activities.tolist()
+    critical = (result.total_float <= tol).tolist()
+    heads = np.asarray(v).tolist()
+    late = result.late[result.order]
+    start = np.flatnonzero(late <= tol)
+    x = int(result.order[start[0]]) if len(start) else None
+    path = []
+    while x is not None:
+        following = None
+        for k in activities[indptr[x]:indptr[x + 1]]:
+            if critical[k]:
+                path.append(k)
+                following = heads[k]
+                break
+        x = following
+    return path
+
+
+# Etykieta zdarzenia: 0 -> A, 25 -> Z, 26 -> AA, 27 -> AB, ...
+def event_label(i):
+    label = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        label = ascii_uppercase[r] + label
+    return label
+
+
+def _number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+# Plik z czynnościami: "początek koniec czas_trwania" w każdej linii
+def load_tasks(filename):
+    tasks = []
+    with open(filename) as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            if len(parts) != 3:
+                raise ValueError(f"Nieprawidłowa linia: {line.strip()!r}")
+            tasks.append((parts[0], parts[1], _number(parts[2])))
+    return tasks
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Metoda ścieżki krytycznej dla dużych projektów")
+    parser.add_argument("file", help="plik z czynnościami (początek koniec czas_trwania)")
+    parser.add_argument("--show", type=int, default=20, help="ile czynności ścieżki krytycznej wypisać")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    names, u, v, d = index_events(load_tasks(args.file))
+    successors = csr(len(names), u)
+    result = schedule(len(names), u, v, d, successors)
+    path = critical_path(result, v, successors)
+    print(f"Zdarzenia: {len(names)}, czynności: {len(u)}")
+    print(f"Długość uszeregowania: {result.makespan}")
+    print(f"Czynności krytyczne: {int((result.total_float <= 1e-9).sum())}")
+    shown = ", ".join(f"z{k + 1}" for k in path[:args.show])
+    print(f"Ścieżka krytyczna ({len(path)} czynności): {shown}" + (", ..." if len(path) > args.show else ""))
+    print(f"Czas: {time.perf_counter() - start:.2f} s")